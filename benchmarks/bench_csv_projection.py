@@ -0,0 +1,79 @@
+"""бенчмарк стандартизации строк CSV: вложенный цикл по заголовкам против позиционной проекции
+
+Запуск:
+    python benchmarks/bench_csv_projection.py --rows 1000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import List, Dict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from interv.main import EmployeeData, standardize_headers  # noqa: E402
+
+
+def legacy_read_and_standardize_csv(file_path: str) -> List[Dict[str, str]]:
+    """прежняя реализация: readlines() и поиск заголовка для каждого значения"""
+    with open(file_path, 'r') as file:
+        lines = file.readlines()
+
+    raw_headers = lines[0].strip().split(',')
+    headers_mapping = standardize_headers(raw_headers)
+
+    data = []
+    for line in lines[1:]:
+        values = line.strip().split(',')
+        row_dict = {}
+        for i, value in enumerate(values):
+            for standard_key, original_header in headers_mapping.items():
+                if raw_headers[i].lower() == original_header.lower():
+                    row_dict[standard_key] = value
+
+        for key in ['id', 'email', 'name', 'department', 'hours_worked', 'hourly_rate']:
+            if key not in row_dict:
+                row_dict[key] = ''
+        data.append(row_dict)
+
+    return data
+
+
+def write_synthetic_csv(file_path: str, rows: int) -> None:
+    """синтетический файл в формате csv/data3.csv (колонки не в стандартном порядке)"""
+    departments = ['Sales', 'HR', 'Design', 'Marketing', 'Engineering']
+    with open(file_path, 'w') as file:
+        file.write('email,name,department,hours_worked,salary,id\n')
+        for i in range(rows):
+            file.write(f'user{i}@example.com,User {i},{departments[i % 5]},{150 + i % 30},{30 + i % 40},{i}\n')
+
+
+def measure(label: str, func, file_path: str, rows: int) -> float:
+    start = time.perf_counter()
+    result = func(file_path)
+    elapsed = time.perf_counter() - start
+    assert len(result) == rows
+    print(f"{label:<12} {elapsed:8.2f} s  {rows / elapsed:12,.0f} rows/s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Бенчмарк стандартизации строк CSV")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="Количество строк в синтетическом файле")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, 'synthetic.csv')
+        write_synthetic_csv(file_path, args.rows)
+
+        reader = EmployeeData([file_path])
+        assert legacy_read_and_standardize_csv(file_path)[:100] == reader.read_and_standardize_csv(file_path)[:100]
+
+        before = measure('before', legacy_read_and_standardize_csv, file_path, args.rows)
+        after = measure('after', reader.read_and_standardize_csv, file_path, args.rows)
+        print(f"speedup      {before / after:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
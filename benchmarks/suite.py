@@ -0,0 +1,152 @@
+"""бенчмарк конвейера от чтения файлов до отчетов
+
+Каждый этап замеряется отдельно: время, строк в секунду и пиковая память (tracemalloc).
+Результат сохраняется в JSON и может сравниваться с базовой линией:
+
+    python benchmarks/suite.py --rows 200000 --output benchmarks/baseline.json
+    python benchmarks/suite.py --rows 200000 --compare benchmarks/baseline.json --tolerance 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from interv.main import EmployeeData, ReportGenerator, sorting_data  # noqa: E402
+from interv.output import ReportWriter  # noqa: E402
+
+if __package__:
+    from .synthetic import generate_exports
+else:
+    from synthetic import generate_exports  # noqa: E402
+
+REPORT_OPTIONS = {'limit': 10, 'min_salary': 5000, 'max_salary': 7000}
+
+
+def measure(func: Callable[[], object], rows: int, trace_memory: bool = True) -> Dict[str, float]:
+    """время этапа и (отдельным прогоном) пиковая память"""
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    func()
+    seconds = time.perf_counter() - start_wall
+    result = {
+        'seconds': round(seconds, 6),
+        'cpu_seconds': round(time.process_time() - start_cpu, 6),
+        'rows': rows,
+        'rows_per_sec': round(rows / seconds, 1) if seconds > 0 else 0.0,
+    }
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            func()
+            result['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run_suite(files: List[str], trace_memory: bool = True) -> Dict[str, Dict[str, float]]:
+    reader = EmployeeData(files)
+    csv_files = [file for file in files if file.endswith('.csv')]
+    json_files = [file for file in files if file.endswith('.json')]
+    all_rows = reader.process_multiple_files()
+    total = len(all_rows)
+    sorted_rows = sorting_data(all_rows)
+
+    stages = {}
+    if csv_files:
+        csv_rows = sum(len(reader.read_and_standardize_csv(file)) for file in csv_files)
+        stages['read_and_standardize_csv'] = measure(
+            lambda: [reader.read_and_standardize_csv(file) for file in csv_files], csv_rows, trace_memory)
+    if json_files:
+        json_rows = sum(len(reader.read_and_standardize_json(file)) for file in json_files)
+        stages['read_and_standardize_json'] = measure(
+            lambda: [reader.read_and_standardize_json(file) for file in json_files], json_rows, trace_memory)
+    stages['sorting_data'] = measure(lambda: sorting_data(all_rows), total, trace_memory)
+    stages['group_by'] = measure(lambda: reader.group_by(sorted_rows, 'department'), total, trace_memory)
+
+    with open(os.devnull, 'w') as sink:
+        for report_type in ReportGenerator([]).get_available_reports():
+            def run_report(report_type=report_type):
+                ReportGenerator(sorted_rows, presorted=True, writer=ReportWriter(sink),
+                                options=REPORT_OPTIONS).run_report(report_type)
+            stages[f'report:{report_type}'] = measure(run_report, total, trace_memory)
+    return stages
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """регрессии относительно базовой линии: падение пропускной способности или рост памяти"""
+    problems = []
+    if baseline.get('meta', {}).get('rows') != current['meta']['rows']:
+        print("Внимание: базовая линия снята на другом объеме данных, сравнение приблизительное.",
+              file=sys.stderr)
+    for stage, before in baseline.get('stages', {}).items():
+        after = current['stages'].get(stage)
+        if after is None:
+            continue
+        if before.get('rows_per_sec') and after['rows_per_sec'] < before['rows_per_sec'] * (1 - tolerance):
+            problems.append(f"{stage}: {after['rows_per_sec']:,.0f} rows/s против {before['rows_per_sec']:,.0f}")
+        if before.get('peak_memory_bytes') and 'peak_memory_bytes' in after and \
+                after['peak_memory_bytes'] > before['peak_memory_bytes'] * (1 + tolerance):
+            problems.append(f"{stage}: пиковая память {after['peak_memory_bytes']:,} B "
+                            f"против {before['peak_memory_bytes']:,} B")
+    return problems
+
+
+def print_table(stages: Dict[str, Dict[str, float]]) -> None:
+    print(f"{'Stage':<28} {'Seconds':>9} {'Rows/s':>14} {'Peak memory, MB':>16}")
+    for stage, result in stages.items():
+        memory = result.get('peak_memory_bytes')
+        memory_text = f"{memory / (1 << 20):16.1f}" if memory is not None else f"{'-':>16}"
+        print(f"{stage:<28} {result['seconds']:9.3f} {result['rows_per_sec']:14,.0f} {memory_text}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк конвейера чтение → сортировка → отчеты")
+    parser.add_argument('--rows', type=int, default=200_000, help="Общее количество сотрудников")
+    parser.add_argument('--files', type=int, default=4, help="Количество файлов (последний — JSON)")
+    parser.add_argument('--data-dir', type=str, default=None,
+                        help="Каталог для синтетических файлов (по умолчанию временный)")
+    parser.add_argument('--no-memory', action='store_true', help="Не измерять пиковую память")
+    parser.add_argument('--output', type=str, default=None, help="Файл для сохранения результатов (JSON)")
+    parser.add_argument('--compare', type=str, default=None, help="Базовая линия для сравнения (JSON)")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Допустимое ухудшение относительно базовой линии (доля)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        files = generate_exports(args.data_dir or tmp_dir, args.rows, args.files)
+        stages = run_suite(files, trace_memory=not args.no_memory)
+
+    result = {
+        'meta': {
+            'rows': args.rows,
+            'files': args.files,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'stages': stages,
+    }
+    print_table(stages)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(result, file, indent=2)
+            file.write('\n')
+
+    if args.compare:
+        with open(args.compare) as file:
+            problems = compare(result, json.load(file), args.tolerance)
+        for problem in problems:
+            print(f"РЕГРЕССИЯ {problem}", file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
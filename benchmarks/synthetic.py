@@ -0,0 +1,96 @@
+"""генератор синтетических выгрузок сотрудников в форматах из csv/
+
+Запуск:
+    python benchmarks/synthetic.py /tmp/exports --rows 1000000 --files 4
+"""
+import argparse
+import json
+import os
+import random
+from typing import Dict, List
+
+# заголовки в том же виде, что и в выгрузках csv/data1..3.csv и csv/workers.json
+CSV_DIALECTS: Dict[str, List[str]] = {
+    'data1': ['id', 'email', 'name', 'department', 'hours_worked', 'hourly_rate'],
+    'data2': ['department', 'id', 'email', 'name', 'hours_worked', 'rate'],
+    'data3': ['email', 'name', 'department', 'hours_worked', 'salary', 'id'],
+}
+JSON_KEYS = ['id', 'email', 'name', 'department', 'hours_worked', 'hourly_rate']
+DEPARTMENTS = ['Marketing', 'Design', 'HR', 'Sales', 'Engineering', 'Finance', 'Support']
+FIRST_NAMES = ['Alice', 'Bob', 'Carol', 'Grace', 'Henry', 'Ivy', 'Karen', 'Liam', 'Mia', 'John', 'Jane', 'Mike']
+LAST_NAMES = ['Johnson', 'Smith', 'Williams', 'Lee', 'Martin', 'Clark', 'White', 'Harris', 'Young', 'Doe', 'Roe']
+
+
+def make_record(employee_id: int, generator: random.Random) -> Dict[str, str]:
+    first, last = generator.choice(FIRST_NAMES), generator.choice(LAST_NAMES)
+    return {
+        'id': str(employee_id),
+        'email': f"{first.lower()}.{last.lower()}{employee_id}@example.com",
+        'name': f"{first} {last}",
+        'department': generator.choice(DEPARTMENTS),
+        'hours_worked': str(generator.randint(140, 180)),
+        'hourly_rate': str(generator.randint(25, 65)),
+    }
+
+
+def write_csv(file_path: str, dialect: str, first_id: int, rows: int, generator: random.Random) -> None:
+    headers = CSV_DIALECTS[dialect]
+    # в выгрузке заголовок может называться иначе, значение берется по стандартному полю
+    standard = ['hourly_rate' if header in ('rate', 'salary') else header for header in headers]
+    with open(file_path, 'w') as file:
+        file.write(','.join(headers) + '\n')
+        for employee_id in range(first_id, first_id + rows):
+            record = make_record(employee_id, generator)
+            file.write(','.join(record[key] for key in standard) + '\n')
+
+
+def write_json(file_path: str, first_id: int, rows: int, generator: random.Random) -> None:
+    """JSON-массив с отступами, как csv/workers.json (пишется по одному объекту)"""
+    with open(file_path, 'w') as file:
+        file.write('[')
+        separator = '\n'
+        for employee_id in range(first_id, first_id + rows):
+            record = make_record(employee_id, generator)
+            body = json.dumps({key: record[key] for key in JSON_KEYS}, indent=4)
+            file.write(separator + '    ' + body.replace('\n', '\n    '))
+            separator = ',\n'
+        file.write('\n]')
+
+
+def generate_exports(directory: str, rows: int, files: int = 4, seed: int = 42) -> List[str]:
+    """набор выгрузок общим объемом rows строк: CSV всех диалектов по очереди и последний файл — JSON
+
+    id сквозные и плотные, без повторов между файлами.
+    """
+    os.makedirs(directory, exist_ok=True)
+    generator = random.Random(seed)
+    dialects = list(CSV_DIALECTS)
+    paths = []
+    first_id = 1
+    for index in range(files):
+        count = rows // files + (1 if index < rows % files else 0)
+        if index == files - 1 and files > 1:
+            path = os.path.join(directory, f"workers{index}.json")
+            write_json(path, first_id, count, generator)
+        else:
+            dialect = dialects[index % len(dialects)]
+            path = os.path.join(directory, f"{dialect}_{index}.csv")
+            write_csv(path, dialect, first_id, count, generator)
+        paths.append(path)
+        first_id += count
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Генерация синтетических выгрузок сотрудников")
+    parser.add_argument('directory', type=str, help="Каталог для файлов")
+    parser.add_argument('--rows', type=int, default=100_000, help="Общее количество сотрудников")
+    parser.add_argument('--files', type=int, default=4, help="Количество файлов (последний — JSON)")
+    parser.add_argument('--seed', type=int, default=42, help="Зерно генератора случайных чисел")
+    args = parser.parse_args()
+    for path in generate_exports(args.directory, args.rows, args.files, args.seed):
+        print(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .table import EmployeeTable
+
+
+def _to_int(value: str) -> Optional[int]:
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _to_float(value: str) -> Optional[float]:
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+class DepartmentStats:
+    """накопленные показатели одного отдела"""
+    __slots__ = ('employees', 'hours_total', 'payout_total', 'rate_total', 'rate_count', 'order')
+
+    def __init__(self, order: Tuple[int, int]):
+        self.employees = 0
+        self.hours_total = 0
+        self.payout_total = 0
+        self.rate_total = 0.0
+        self.rate_count = 0
+        self.order = order  # (минимальный id, порядковый номер строки) — положение отдела в отчете
+
+    @property
+    def average_rate(self) -> Optional[float]:
+        if not self.rate_count:
+            return None
+        return self.rate_total / self.rate_count
+
+
+class DepartmentAggregator:
+    """однопроходная агрегация по отделам: суммы, количества и средние без сортировки и группировки
+
+    Память — O(количество отделов). При order_by_id=True отделы упорядочиваются так же,
+    как после сортировки всех строк по id (по первому сотруднику с наименьшим id),
+    иначе — в порядке первого появления.
+    """
+
+    def __init__(self, order_by_id: bool = False):
+        self.order_by_id = order_by_id
+        self.departments: Dict[str, DepartmentStats] = {}
+        self.rows = 0
+
+    def add(self, row: Dict[str, str]) -> None:
+        rate = row['hourly_rate']
+        self._add(row['department'], int(row['id']) if self.order_by_id else None,
+                  _to_int(row['hours_worked']), _to_int(rate), _to_float(rate))
+
+    def _add(self, department: str, row_id: Optional[int], hours: Optional[int],
+             rate: Optional[int], real_rate: Optional[float]) -> None:
+        position = self.rows
+        self.rows += 1
+        if row_id is None:
+            row_id = position
+
+        stats = self.departments.get(department)
+        if stats is None:
+            stats = self.departments[department] = DepartmentStats((row_id, position))
+        elif row_id < stats.order[0]:
+            stats.order = (row_id, position)
+
+        stats.employees += 1
+        if hours is not None:
+            stats.hours_total += hours
+            if rate is not None:
+                stats.payout_total += hours * rate
+        if real_rate is not None:
+            stats.rate_total += real_rate
+            stats.rate_count += 1
+
+    def consume(self, rows: Iterable[Dict[str, str]]) -> 'DepartmentAggregator':
+        for row in rows:
+            self.add(row)
+        return self
+
+    def consume_table(self, table: EmployeeTable) -> 'DepartmentAggregator':
+        """агрегация колоночной таблицы: числа берутся из типизированных колонок без разбора строк"""
+        ids = table.id_keys() if self.order_by_id else None
+        departments, hours, rates = table.departments, table.hours, table.rates
+        for i in range(len(table)):
+            self._add(departments[i], ids[i] if ids is not None else None,
+                      hours.integer(i), rates.integer(i), rates.real(i))
+        return self
+
+    def merge(self, other: 'DepartmentAggregator') -> 'DepartmentAggregator':
+        """добавление агрегатов следующей части данных (например, другого файла), как будто ее строки
+        прочитаны после уже учтенных"""
+        offset = self.rows
+        for department, other_stats in other.departments.items():
+            row_id, position = other_stats.order
+            order = (row_id if self.order_by_id else row_id + offset, position + offset)
+            stats = self.departments.get(department)
+            if stats is None:
+                stats = self.departments[department] = DepartmentStats(order)
+            elif order[0] < stats.order[0]:
+                stats.order = order
+            stats.employees += other_stats.employees
+            stats.hours_total += other_stats.hours_total
+            stats.payout_total += other_stats.payout_total
+            stats.rate_total += other_stats.rate_total
+            stats.rate_count += other_stats.rate_count
+        self.rows += other.rows
+        return self
+
+    def items(self) -> List[Tuple[str, DepartmentStats]]:
+        """отделы в порядке вывода"""
+        return sorted(self.departments.items(), key=lambda item: item[1].order)
@@ -0,0 +1,159 @@
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+from typing import Deque, Dict, Iterator, List, Optional, Tuple, Union
+
+from .main import EmployeeData
+from .table import EmployeeTable
+
+IO_CONCURRENCY = 16  # одновременных обращений к диску по умолчанию
+READ_AHEAD = 4  # сколько блоков каждого файла читать впереди разбора
+
+
+async def find_missing_files(files: List[str], concurrency: int = IO_CONCURRENCY) -> List[str]:
+    """параллельная проверка существования файлов, не более concurrency обращений сразу"""
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+        exists = await asyncio.gather(*(loop.run_in_executor(executor, os.path.exists, file) for file in files))
+    return [file for file, found in zip(files, exists) if not found]
+
+
+def missing_files(files: List[str], concurrency: int = IO_CONCURRENCY) -> List[str]:
+    return asyncio.run(find_missing_files(files, concurrency))
+
+
+class ReadAheadFile:
+    """файл, который поток пула читает блоками впереди разбора (интерфейс read() для iter_lines)
+
+    Сначала проверяется кэш: если таблица найдена, файл не открывается. Затем поток читает блоки
+    по chunk_size, пока их не накопится read_ahead, и продолжает, когда разбор их забирает: чтение
+    с диска идет одновременно с разбором, а в памяти не больше read_ahead блоков на файл.
+    CSV при --mmap читается отображением по пути, поэтому для него проверяется только кэш.
+    """
+
+    def __init__(self, employee_data: EmployeeData, file_path: str, read_ahead: int = READ_AHEAD):
+        self.employee_data = employee_data
+        self.name = file_path
+        self.read_ahead = read_ahead
+        self.key: Optional[str] = None
+        self.table: Optional[EmployeeTable] = None
+        self.chunks: Deque[str] = deque()
+        self.ready = False  # кэш проверен
+        self.done = False  # файл дочитан, чтение прервано или завершилось ошибкой
+        self.closed = False
+        self.error: Optional[Exception] = None
+        self.condition = threading.Condition()
+
+    def fill(self) -> None:
+        """чтение в потоке пула"""
+        try:
+            if self.closed:
+                return
+            cache = self.employee_data.cache
+            if cache is not None:
+                self.key = cache.key(self.name)  # до чтения файла
+                self.table = cache.get(self.name, self.key)
+            with self.condition:
+                self.ready = True
+                self.condition.notify_all()
+            mmap_csv = self.employee_data.mmap_csv and os.path.splitext(self.name)[-1].lower() == '.csv'
+            if self.table is not None or mmap_csv:
+                return
+            with open(self.name, 'r') as file:
+                while True:
+                    with self.condition:
+                        self.condition.wait_for(lambda: self.closed or len(self.chunks) < self.read_ahead)
+                        if self.closed:
+                            return
+                    chunk = file.read(self.employee_data.chunk_size)
+                    if not chunk:
+                        return
+                    with self.condition:
+                        self.chunks.append(chunk)
+                        self.condition.notify_all()
+        except Exception as e:
+            self.error = e
+        finally:
+            with self.condition:
+                self.ready = self.done = True
+                self.condition.notify_all()
+
+    def wait_ready(self) -> Tuple[Optional[str], Optional[EmployeeTable]]:
+        """ключ кэша и таблица из кэша (или None), когда кэш проверен"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.ready)
+        return self.key, self.table
+
+    def read(self, size: int) -> str:
+        """следующий прочитанный блок; размер блока задан chunk_size"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.chunks or self.done)
+            if self.chunks:
+                chunk = self.chunks.popleft()
+                self.condition.notify_all()
+                return chunk
+        if self.error is not None:
+            raise self.error
+        return ''
+
+    def close(self) -> None:
+        """остановка чтения: поток пула освобождается, прочитанные блоки отбрасываются"""
+        with self.condition:
+            self.closed = True
+            self.chunks.clear()
+            self.condition.notify_all()
+
+
+Loaded = Union[ReadAheadFile, EmployeeTable]  # файл, читаемый впереди разбора, или таблица из кэша
+
+
+def iter_loaded_files(employee_data: EmployeeData) -> Iterator[Tuple[str, Optional[str], Loaded]]:
+    """файлы в исходном порядке вместе с ключом кэша; io_concurrency файлов читаются впереди разбора
+
+    Пока разбирается текущий файл, пул дочитывает его и начинает следующие: в памяти не больше
+    io_concurrency × READ_AHEAD блоков по chunk_size. Файл закрывается, когда запрошен следующий.
+    """
+    concurrency = max(employee_data.io_concurrency, 1)
+    files = iter(employee_data.files)
+    pending: Deque[ReadAheadFile] = deque()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        def schedule() -> None:
+            # задания выполняются по порядку, поэтому текущий файл всегда читается раньше следующих
+            while len(pending) < concurrency:
+                file_path = next(files, None)
+                if file_path is None:
+                    return
+                reader = ReadAheadFile(employee_data, file_path)
+                executor.submit(reader.fill)
+                pending.append(reader)
+
+        try:
+            schedule()
+            while pending:
+                reader = pending.popleft()
+                schedule()
+                key, table = reader.wait_ready()
+                try:
+                    yield reader.name, key, table if table is not None else reader
+                finally:
+                    reader.close()
+        finally:
+            for reader in pending:
+                reader.close()
+
+
+def iter_rows_async(employee_data: EmployeeData) -> Iterator[Dict[str, str]]:
+    """строки всех файлов; порядок совпадает с последовательным чтением"""
+    cache = employee_data.cache
+    for file_path, key, loaded in iter_loaded_files(employee_data):
+        if isinstance(loaded, EmployeeTable):
+            yield from loaded
+        elif cache is not None:
+            table = EmployeeTable.from_rows(employee_data.iter_stream(file_path, loaded))
+            cache.put(file_path, table, key)
+            yield from table
+        else:
+            yield from employee_data.iter_stream(file_path, loaded)
@@ -0,0 +1,99 @@
+import hashlib
+import os
+from typing import Optional
+
+from .headers import header_mapping_version
+from .table import EmployeeTable, dump_table, load_table
+
+CACHE_SIZE = 512 << 20  # предельный размер кэша по умолчанию (байт)
+CACHE_SUFFIX = '.table'
+
+
+class ParsedFileCache:
+    """дисковый кэш стандартизированных таблиц
+
+    Ключ — абсолютный путь, размер, mtime файла и версия маппинга заголовков: любое изменение
+    файла или правил стандартизации дает новый ключ. При превышении max_bytes удаляются
+    записи, к которым дольше всего не обращались (LRU по mtime записи).
+    """
+
+    def __init__(self, directory: str, max_bytes: int = CACHE_SIZE):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._total: Optional[int] = None  # размер записей в каталоге; считается при первой записи
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, file_path: str) -> str:
+        """ключ записи; берется до разбора файла, чтобы изменения во время разбора дали новый ключ"""
+        stat = os.stat(file_path)
+        source = f"{os.path.abspath(file_path)}\0{stat.st_size}\0{stat.st_mtime_ns}\0{header_mapping_version()}"
+        return hashlib.sha1(source.encode('utf-8', 'surrogatepass')).hexdigest()
+
+    def entry_path(self, file_path: str, key: Optional[str] = None) -> str:
+        return os.path.join(self.directory, (key or self.key(file_path)) + CACHE_SUFFIX)
+
+    def get(self, file_path: str, key: Optional[str] = None) -> Optional[EmployeeTable]:
+        """таблица из кэша или None, если записи нет или она повреждена"""
+        entry = self.entry_path(file_path, key)
+        try:
+            with open(entry, 'rb') as file:
+                table = load_table(file.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError, TypeError, IndexError):
+            self._remove(entry)
+            return None
+        try:
+            os.utime(entry)  # отметка последнего использования для LRU
+        except OSError:
+            pass
+        return table
+
+    def put(self, file_path: str, table: EmployeeTable, key: Optional[str] = None) -> None:
+        """запись таблицы под ключом, взятым до разбора; при ошибке записи отчет строится без кэша"""
+        entry = self.entry_path(file_path, key)
+        temp_path = f"{entry}.{os.getpid()}.tmp"
+        data = dump_table(table)
+        try:
+            with open(temp_path, 'wb') as file:
+                file.write(data)
+            os.replace(temp_path, entry)  # атомарная запись: читатели не увидят недописанный файл
+        except OSError:  # каталог только для чтения или диск заполнен
+            self._remove(temp_path)
+            return
+        if self._total is not None and self._total + len(data) <= self.max_bytes:
+            self._total += len(data)
+        else:
+            self._total = self.evict()  # каталог обходится при первой записи и при превышении предела
+
+    def evict(self) -> int:
+        """удаление давно не использованных записей сверх max_bytes; возвращает оставшийся размер"""
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.directory) as scan:
+                for item in scan:
+                    if not item.name.endswith(CACHE_SUFFIX):
+                        continue
+                    try:
+                        stat = item.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, item.path))
+                    total += stat.st_size
+        except OSError:
+            return 0
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+        return total
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,73 @@
+"""точка входа команды interv
+
+Модуль держит только разбор аргументов: остальное (чтение JSON, пул процессов, кэш, mmap,
+асинхронное чтение, NumPy) загружается лениво, когда его требуют выбранный отчет и параметры.
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+from .main import CHUNK_SIZE, CONFLICT_POLICIES, main as run
+from .output import OUTPUT_FORMATS
+from .profiling import PROFILE_FORMATS
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Скрипт для генерации отчетов по CSV/JSON")
+    parser.add_argument('files', metavar='F', type=str, nargs='+', help="Список файлов")
+    parser.add_argument('--report', type=str, required=True,
+                        help="Тип отчета (например, 'payout', 'average_hourly_rate', 'top_earners', 'salary_range', "
+                             "'rate_statistics')")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help="Размер блока при потоковом чтении файлов (символов)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Количество процессов для параллельного разбора файлов")
+    parser.add_argument('--cache-dir', type=str, default=None,
+                        help="Каталог кэша разобранных файлов (по умолчанию кэш выключен)")
+    parser.add_argument('--cache-size', type=int, default=None,
+                        help="Предельный размер кэша в МБ (по умолчанию 512)")
+    parser.add_argument('--header-alias', action='append', default=[], metavar='FIELD=ALIAS',
+                        help="Дополнительный синоним заголовка, например hours_worked=h_work (можно повторять)")
+    parser.add_argument('--output', type=str, default=None,
+                        help="Файл для записи отчета (по умолчанию стандартный вывод)")
+    parser.add_argument('--format', type=str, default='text', choices=OUTPUT_FORMATS,
+                        help="Формат вывода: text, csv или json")
+    parser.add_argument('--limit', type=int, default=None,
+                        help="Количество сотрудников на отдел для отчета top_earners (по умолчанию 10)")
+    parser.add_argument('--min', dest='min_salary', type=float, default=None,
+                        help="Нижняя граница зарплаты для отчета salary_range")
+    parser.add_argument('--max', dest='max_salary', type=float, default=None,
+                        help="Верхняя граница зарплаты для отчета salary_range")
+    parser.add_argument('--profile', nargs='?', const='text', default=None, choices=PROFILE_FORMATS,
+                        help="Замер этапов (время, строки, память) в stderr: text (по умолчанию) или json")
+    parser.add_argument('--dedupe-by', type=str, default=None, metavar='FIELDS',
+                        help="Слияние повторов сотрудника по полям: id, email или id,email")
+    parser.add_argument('--on-conflict', type=str, default='first', choices=CONFLICT_POLICIES,
+                        help="Какую строку оставлять при слиянии: first, last или sum_hours")
+    parser.add_argument('--io-concurrency', type=int, default=0, metavar='N',
+                        help="Асинхронная проверка и чтение до N файлов одновременно (для сетевых дисков)")
+    parser.add_argument('--mmap', action='store_true',
+                        help="Чтение CSV через mmap: строки ищутся в байтах отображения, блок декодируется одним вызовом")
+    parser.add_argument('--percentiles', type=str, default=None, metavar='P1,P2',
+                        help="Перцентили ставки для отчета rate_statistics (по умолчанию 25,75,90)")
+    parser.add_argument('--numeric-backend', type=str, default='auto', choices=('auto', 'numpy', 'python'),
+                        help="Вычислитель для rate_statistics: NumPy, если установлен (auto), или чистый Python")
+    parser.add_argument('--incremental', dest='incremental_dir', type=str, default=None, metavar='DIR',
+                        help="Каталог агрегатов по файлам: сводные отчеты пересчитывают только измененные файлы")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return run(args.files, args.report, chunk_size=args.chunk_size, workers=args.workers,
+               cache_dir=args.cache_dir, cache_size=args.cache_size << 20 if args.cache_size is not None else None,
+               header_aliases=args.header_alias, output=args.output, output_format=args.format,
+               limit=args.limit, min_salary=args.min_salary, max_salary=args.max_salary, profile=args.profile,
+               dedupe_by=args.dedupe_by, on_conflict=args.on_conflict,
+               io_concurrency=args.io_concurrency, mmap_csv=args.mmap,
+               percentiles=args.percentiles, numeric_backend=args.numeric_backend,
+               incremental_dir=args.incremental_dir)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Pattern, Tuple
+
+# синонимы заголовков для каждого стандартного поля; заголовок, равный синониму, относится к его полю,
+# остальные — к первому по порядку полю, один из синонимов которого входит в заголовок подстрокой
+HEADER_ALIASES: Dict[str, List[str]] = {
+    'id': ['id', 'identifier', 'emp_id', 'employee_id'],
+    'email': ['email', 'e-mail', 'mail', 'contact'],
+    'name': ['name', 'full_name', 'employee_name'],
+    'department': ['department', 'dept', 'team'],
+    'hours_worked': ['hours_worked', 'hours', 'work_hours'],
+    'hourly_rate': ['hourly_rate', 'rate', 'salary', 'wage', 'hour_rate']
+}
+RESOLVER_VERSION = 2  # меняется вместе с правилами сопоставления (входит в header_mapping_version)
+
+_registered_aliases: List[Tuple[str, str]] = []
+_patterns: List[Tuple[str, Pattern]] = []
+_exact_fields: Dict[str, str] = {}
+_version = ''
+
+
+def _scan_header(header: str) -> Optional[str]:
+    """поиск поля подстрокой по предкомпилированным шаблонам"""
+    for standard_field, pattern in _patterns:
+        if pattern.search(header):
+            return standard_field
+    return None
+
+
+def _compile() -> None:
+    """пересборка шаблонов, таблицы точных совпадений и версии маппинга"""
+    global _version
+    _patterns[:] = [
+        (standard_field, re.compile('|'.join(re.escape(keyword) for keyword in keywords)))
+        for standard_field, keywords in HEADER_ALIASES.items() if keywords
+    ]
+    # заголовок, совпадающий с синонимом, относится к полю, для которого синоним объявлен:
+    # подстрокой ищутся только остальные ('paid' для hourly_rate не должен стать 'id')
+    _exact_fields.clear()
+    for standard_field, keywords in HEADER_ALIASES.items():
+        for keyword in keywords:
+            _exact_fields.setdefault(keyword, standard_field)
+
+    _version = ''  # пересчитывается при первом запросе header_mapping_version
+    _standardize_header_tuple.cache_clear()
+
+
+def resolve_header(header: str) -> Optional[str]:
+    """стандартное поле для заголовка (в нижнем регистре) или None"""
+    try:
+        return _exact_fields[header]
+    except KeyError:
+        return _scan_header(header)
+
+
+@lru_cache(maxsize=1024)
+def _standardize_header_tuple(headers: Tuple[str, ...]) -> Tuple[Tuple[str, str], ...]:
+    standardized_headers = {}
+    for header in headers:
+        header = header.lower()
+        standard_field = resolve_header(header)
+        if standard_field is not None:
+            standardized_headers[standard_field] = header
+    return tuple(standardized_headers.items())
+
+
+def standardize_headers(headers: List[str]) -> Dict[str, str]:
+    """стандартизация заголовков"""
+    return dict(_standardize_header_tuple(tuple(headers)))
+
+
+def register_header_alias(standard_field: str, alias: str) -> None:
+    """добавление синонима заголовка для стандартного поля (например, 'hours_worked' -> 'h_work')"""
+    if standard_field not in HEADER_ALIASES:
+        raise ValueError(f"Неизвестное поле '{standard_field}'. "
+                         f"Доступные поля: {', '.join(HEADER_ALIASES)}")
+    alias = alias.strip().lower()
+    if not alias:
+        raise ValueError("Синоним заголовка не может быть пустым.")
+    if alias in HEADER_ALIASES[standard_field]:
+        return
+    HEADER_ALIASES[standard_field].append(alias)
+    _registered_aliases.append((standard_field, alias))
+    _compile()
+
+
+def registered_header_aliases() -> Tuple[Tuple[str, str], ...]:
+    """синонимы, добавленные через register_header_alias (для передачи в дочерние процессы)"""
+    return tuple(_registered_aliases)
+
+
+def header_mapping_version() -> str:
+    """отпечаток правил стандартизации; меняется при добавлении синонимов"""
+    global _version
+    if not _version:
+        import hashlib  # нужен только кэшу и инкрементальному режиму
+        rules = repr((RESOLVER_VERSION, sorted((field, sorted(keywords)) for field, keywords in HEADER_ALIASES.items())))
+        _version = hashlib.sha1(rules.encode('utf-8')).hexdigest()[:16]
+    return _version
+
+
+_compile()
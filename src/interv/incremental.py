@@ -0,0 +1,179 @@
+import hashlib
+import io
+import marshal
+import os
+from typing import BinaryIO, Dict, Optional, Tuple
+
+from .aggregation import DepartmentAggregator, DepartmentStats
+from .headers import header_mapping_version
+from .main import EmployeeData
+
+STATE_FORMAT_VERSION = 1  # версия формата сохраненных частичных агрегатов
+STATE_SUFFIX = '.partial'
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def file_digest(file_path: str) -> str:
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class HashingReader(io.RawIOBase):
+    """чтение бинарного файла с подсчетом sha1: хеш считается во время разбора, без второго прохода"""
+
+    def __init__(self, file: BinaryIO):
+        super().__init__()
+        self.file = file
+        self.name = file.name
+        self.digest = hashlib.sha1()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = self.file.readinto(buffer)
+        if size:
+            self.digest.update(memoryview(buffer)[:size])
+        return size
+
+    def hexdigest(self) -> str:
+        """хеш всего файла: непрочитанный разбором остаток дочитывается"""
+        for block in iter(lambda: self.file.read(HASH_BLOCK_SIZE), b''):
+            self.digest.update(block)
+        return self.digest.hexdigest()
+
+
+def same_file(stat: os.stat_result, file_path: str) -> bool:
+    """файл не менялся с момента stat (размер и mtime совпадают)"""
+    try:
+        current = os.stat(file_path)
+    except OSError:
+        return False
+    return (current.st_size, current.st_mtime_ns) == (stat.st_size, stat.st_mtime_ns)
+
+
+def dump_partial(aggregator: DepartmentAggregator) -> Tuple:
+    return aggregator.rows, tuple(
+        (department, stats.employees, stats.hours_total, stats.payout_total,
+         stats.rate_total, stats.rate_count) + stats.order
+        for department, stats in aggregator.departments.items()
+    )
+
+
+def load_partial(state: Tuple) -> DepartmentAggregator:
+    rows, departments = state
+    aggregator = DepartmentAggregator(order_by_id=True)
+    aggregator.rows = rows
+    for department, employees, hours_total, payout_total, rate_total, rate_count, row_id, position in departments:
+        stats = aggregator.departments[department] = DepartmentStats((row_id, position))
+        stats.employees = employees
+        stats.hours_total = hours_total
+        stats.payout_total = payout_total
+        stats.rate_total = rate_total
+        stats.rate_count = rate_count
+    return aggregator
+
+
+class PartialAggregateStore:
+    """сохраненные агрегаты по отделам для каждого входного файла
+
+    Файл считается неизменным, если совпали размер и mtime; при другом mtime и том же размере
+    сравнивается хеш содержимого. Пересчитываются только измененные файлы, остальные части
+    берутся с диска и объединяются в порядке файлов — результат тот же, что у полного прохода.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.reused = 0  # счетчики последнего aggregate(): файлы из сохраненного состояния
+        self.recomputed = 0  # и разобранные заново
+        os.makedirs(directory, exist_ok=True)
+
+    def entry_path(self, file_path: str) -> str:
+        name = hashlib.sha1(os.path.abspath(file_path).encode('utf-8', 'surrogatepass')).hexdigest()
+        return os.path.join(self.directory, name + STATE_SUFFIX)
+
+    def load(self, file_path: str) -> Optional[Dict]:
+        """сохраненное состояние файла или None, если его нет, оно повреждено или устарело"""
+        try:
+            with open(self.entry_path(file_path), 'rb') as file:
+                entry = marshal.loads(file.read())
+        except (OSError, ValueError, EOFError, TypeError):
+            return None
+        if (not isinstance(entry, dict) or entry.get('version') != STATE_FORMAT_VERSION
+                or entry.get('headers') != header_mapping_version()):
+            return None
+        return entry
+
+    def save(self, file_path: str, stat: os.stat_result, digest: str, state: Tuple) -> None:
+        """запись состояния файла; при ошибке записи отчет строится без сохранения, как в ParsedFileCache"""
+        entry = {
+            'version': STATE_FORMAT_VERSION,
+            'headers': header_mapping_version(),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'digest': digest,
+            'state': state,
+        }
+        path = self.entry_path(file_path)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'wb') as file:
+                file.write(marshal.dumps(entry))
+            os.replace(temp_path, path)  # атомарная запись, как в ParsedFileCache
+        except OSError:  # каталог только для чтения или диск заполнен
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def partial(self, employee_data: EmployeeData, file_path: str) -> DepartmentAggregator:
+        """агрегаты одного файла: сохраненные, если файл не менялся, иначе — пересчитанные
+
+        Новый или измененный файл читается один раз: хеш считается по ходу разбора. Отдельно хешируется
+        только файл того же размера с другим mtime — это дешевле разбора, если содержимое не менялось.
+        Состояние сохраняется, только если размер и mtime файла не изменились за время разбора.
+        """
+        stat = os.stat(file_path)
+        entry = self.load(file_path)
+        if entry is not None and entry['size'] == stat.st_size:
+            if entry['mtime_ns'] == stat.st_mtime_ns:
+                self.reused += 1
+                return load_partial(entry['state'])
+            digest = file_digest(file_path)
+            if digest == entry['digest']:  # файл перезаписан тем же содержимым
+                if same_file(stat, file_path):
+                    self.save(file_path, stat, digest, entry['state'])
+                self.reused += 1
+                return load_partial(entry['state'])
+
+        with open(file_path, 'rb') as file:
+            reader = HashingReader(file)
+            # та же кодировка и обработка переводов строк, что у open() в текстовом режиме
+            with io.TextIOWrapper(io.BufferedReader(reader)) as stream:
+                rows = employee_data.iter_stream(file_path, stream)
+                aggregator = DepartmentAggregator(order_by_id=True).consume(rows)
+                digest = reader.hexdigest()
+        if same_file(stat, file_path):
+            self.save(file_path, stat, digest, dump_partial(aggregator))
+        self.recomputed += 1
+        return aggregator
+
+    def aggregate(self, employee_data: EmployeeData) -> DepartmentAggregator:
+        """агрегаты всех файлов: пересчитываются только измененные"""
+        if employee_data.dedupe_by:
+            raise ValueError("Инкрементальный режим несовместим со слиянием повторов (--dedupe-by)")
+        # файлы разбираются здесь же, потоково с подсчетом хеша: ускорители чтения не применяются
+        ignored = [option for option, enabled in (('--workers', employee_data.workers > 1),
+                                                  ('--cache-dir', employee_data.cache is not None),
+                                                  ('--io-concurrency', employee_data.io_concurrency > 0),
+                                                  ('--mmap', employee_data.mmap_csv)) if enabled]
+        if ignored:
+            raise ValueError(f"Инкрементальный режим несовместим с параметрами: {', '.join(ignored)}")
+        self.reused = self.recomputed = 0
+        result = DepartmentAggregator(order_by_id=True)
+        for file_path in employee_data.files:
+            result.merge(self.partial(employee_data, file_path))
+        return result
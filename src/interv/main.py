@@ -1,40 +1,210 @@
-import argparse
 import os
-import json  # доп.функционал и показ маштабируемости, для простоты использовал внешний модуль
-from typing import List, Dict
+import sys
+import re
+from contextlib import nullcontext
+from operator import itemgetter
+from typing import TYPE_CHECKING, List, Dict, Iterable, Iterator, TextIO, Tuple, Callable, Optional
+
+if __name__ == '__main__' and not __package__:
+    # запуск файлом (python src/interv/main.py, так вызывают cron-задания): подключаем пакет по пути
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = 'interv'
+
+from .aggregation import DepartmentAggregator
+from .headers import standardize_headers, register_header_alias
+from .profiling import NULL_PROFILER
+from .output import (ReportWriter, render_average_rate_text, render_department_summary_text,
+                     render_payout_text, render_rate_statistics_text)
+from .table import FIELD_ORDER, EmployeeTable, id_order
+
+if TYPE_CHECKING:
+    from .queries import SalaryIndex
+
+KEY_SET_CACHE_SIZE = 1024  # сколько различных наборов ключей JSON помнить при стандартизации
+_JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+CHUNK_SIZE = 1 << 20  # размер блока при потоковом чтении файлов (символов)
+MAX_JSON_ELEMENT = 4 << 20  # сколько символов одного элемента JSON-массива читать, прежде чем счесть файл поврежденным
+DUPLICATES_SHOWN = 10  # сколько повторяющихся id перечислять в предупреждении
+_FIELD_SET = frozenset(FIELD_ORDER)
+DEDUPE_FIELDS = ('id', 'email')
+CONFLICT_POLICIES = ('first', 'last', 'sum_hours')
+
+
+def iter_lines(file: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """построчное чтение файла блоками фиксированного размера"""
+    tail = ''
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        lines = (tail + chunk).split('\n')
+        tail = lines.pop()  # незавершенная строка переносится в следующий блок
+        yield from lines
+    if tail:
+        yield tail
+
+
+def iter_json_lines(file: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[object]:
+    """объекты JSON Lines, пустые строки пропускаются"""
+    import json  # json загружается только при чтении JSON-файлов
+    return (json.loads(line) for line in iter_lines(file, chunk_size) if line.strip())
+
+
+def iter_json_array(file: TextIO, chunk_size: int = CHUNK_SIZE,
+                    max_element: int = MAX_JSON_ELEMENT) -> Iterator[object]:
+    """потоковый разбор JSON-массива: элементы отдаются по одному, в памяти — текущий блок и элемент
+
+    Если элемент не разбирается и после max_element символов (но не меньше четырех блоков),
+    файл считается поврежденным: ошибка выдается сразу, без чтения остатка файла в память.
+    """
+    import json
+    decoder = json.JSONDecoder()
+    limit = max(max_element, 4 * chunk_size)
+    buffer = ''
+    pos = 0
+    eof = False
+
+    def read_more() -> None:
+        nonlocal buffer, pos, eof
+        chunk = file.read(chunk_size)
+        if not chunk:
+            eof = True
+        buffer = buffer[pos:] + chunk  # уже разобранная часть буфера отбрасывается
+        pos = 0
+
+    def next_char() -> str:
+        """следующий значимый символ (без сдвига) или '' в конце файла"""
+        nonlocal pos
+        while True:
+            pos = _JSON_WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer) or eof:
+                return buffer[pos:pos + 1]
+            read_more()
+
+    if next_char() != '[':
+        raise ValueError(f"Файл {getattr(file, 'name', '')} должен содержать список объектов JSON.")
+    pos += 1
+    if next_char() == ']':
+        pos += 1
+    else:
+        while True:
+            next_char()
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                if eof:
+                    raise
+                if len(buffer) - pos > limit:
+                    raise ValueError(f"Некорректный JSON в файле {getattr(file, 'name', '')}: элемент не разобран "
+                                     f"после {limit} символов ({e.msg}).") from None
+                read_more()
+                continue
+            if end == len(buffer) and not eof:
+                read_more()  # значение могло оборваться на границе блока (например, число)
+                continue
+            pos = end
+            yield item
+
+            separator = next_char()
+            pos += 1
+            if separator == ']':
+                break
+            if separator != ',':
+                raise ValueError(f"Некорректный JSON: ожидалась ',' или ']', получено {separator!r}.")
 
+    if next_char():
+        raise ValueError("Некорректный JSON: лишние данные после списка.")
 
-def sorting_data(data: List[Dict[str, str]]) -> List[Dict[str, str]]:
-    """сортировка по ID"""
-    sorted_data = sorted(data, key=lambda x: int(x['id']))
-    ordered_data = []
-    standard_field_order = ['id', 'email', 'name', 'department', 'hours_worked', 'hourly_rate']
 
-    for row in sorted_data:
-        ordered_row = {key: row.get(key, '') for key in standard_field_order}
-        ordered_data.append(ordered_row)
+def sorting_data(data: Iterable[Dict[str, str]], duplicates: Optional[List[int]] = None) -> List[Dict[str, str]]:
+    """сортировка по ID (EmployeeTable сортируется по колонке id без распаковки в словари)
+
+    Повторяющиеся id (например, из пересекающихся выгрузок) добавляются в duplicates.
+    """
+    if isinstance(data, EmployeeTable):
+        return data.sorted_by_id(duplicates)
+    if not isinstance(data, list):
+        data = list(data)
+    order, repeated = id_order([int(row['id']) for row in data])
+    if duplicates is not None:
+        duplicates.extend(repeated)
+
+    ordered_data = []
+    for i in order:
+        row = data[i]
+        # строки читателей уже содержат ровно стандартные поля — копия нужна только для чужих словарей
+        if row.keys() != _FIELD_SET:
+            row = {key: row.get(key, '') for key in FIELD_ORDER}
+        ordered_data.append(row)
     return ordered_data
 
 
-def standardize_headers(headers: List[str]) -> Dict[str, str]:
-    """стандартизация заголовков"""
-    field_mapping = {
-        'id': ['id', 'identifier', 'emp_id', 'employee_id'],
-        'email': ['email', 'e-mail', 'mail', 'contact'],
-        'name': ['name', 'full_name', 'employee_name'],
-        'department': ['department', 'dept', 'team'],
-        'hours_worked': ['hours_worked', 'hours', 'work_hours'],
-        'hourly_rate': ['hourly_rate', 'rate', 'salary', 'wage', 'hour_rate']
-    }
+def compile_projection(raw_headers: List[str], headers_mapping: Dict[str, str]) -> Tuple[Tuple[int, ...], ...]:
+    """позиции колонок для каждого стандартного поля (в порядке FIELD_ORDER), вычисляются один раз на файл"""
+    lowered = [header.lower() for header in raw_headers]
+    projection = []
+    for key in FIELD_ORDER:
+        original_header = headers_mapping.get(key)
+        if original_header is None:
+            projection.append(())
+        else:
+            original_header = original_header.lower()
+            projection.append(tuple(i for i, header in enumerate(lowered) if header == original_header))
+    return tuple(projection)
+
+
+def make_row_builder(projection: Tuple[Tuple[int, ...], ...],
+                     fields: Tuple[str, ...] = FIELD_ORDER) -> Callable[[List[str]], Dict[str, str]]:
+    """сборка словаря строки по заранее вычисленным позициям колонок; в словарь попадают только fields"""
+    if fields != FIELD_ORDER:
+        projection = tuple(projection[FIELD_ORDER.index(field)] for field in fields)
+    # при повторяющихся заголовках значение берется из последней колонки, как и раньше;
+    # отсутствующие поля читаются из дописанного в конец строки пустого значения (индекс -1)
+    positions = [columns[-1] if columns else -1 for columns in projection]
+    width = max(positions) + 1
+    if len(positions) == 1:
+        position = positions[0]
+        getter = lambda values: (values[position],)  # noqa: E731
+    else:
+        getter = itemgetter(*positions)
+
+    def build_short_row(values: List[str]) -> Dict[str, str]:
+        # неполная строка: берем последнюю из существующих колонок для каждого поля
+        size = len(values)
+        row_dict = {}
+        for key, columns in zip(fields, projection):
+            present = [i for i in columns if i < size]
+            row_dict[key] = values[present[-1]] if present else ''
+        return row_dict
+
+    def build_row(values: List[str]) -> Dict[str, str]:
+        if len(values) < width:
+            return build_short_row(values)
+        values.append('')
+        return dict(zip(fields, getter(values)))
+
+    return build_row
+
+
+def _dedupe_key(field: str, value: str) -> str:
+    value = value.strip()
+    return value.lower() if field == 'email' else value
+
+
+def _hours(row: Dict[str, str]) -> Optional[int]:
+    try:
+        return int(row.get('hours_worked', ''))
+    except (ValueError, TypeError):
+        return None
 
-    standardized_headers = {}
-    for header in headers:
-        header = header.lower()
-        for standard_field, keywords in field_mapping.items():
-            if any(keyword in header for keyword in keywords):
-                standardized_headers[standard_field] = header
-                break
-    return standardized_headers
+
+def _sum_hours(kept: Dict[str, str], row: Dict[str, str]) -> Dict[str, str]:
+    """первая строка с суммой часов; пустые и нечисловые часы не учитываются, числовая сторона сохраняется"""
+    hours = _hours(row)
+    if hours is None:
+        return kept
+    kept_hours = _hours(kept)
+    return dict(kept, hours_worked=str(hours if kept_hours is None else kept_hours + hours))
 
 
 def calculate_salary(row: Dict[str, str]) -> float:
@@ -42,80 +212,258 @@ def calculate_salary(row: Dict[str, str]) -> float:
     return int(row['hours_worked']) * int(row['hourly_rate'])
 
 
+def iter_salaries(rows: Iterable[Dict[str, str]]) -> Iterator[Tuple[Dict[str, str], float]]:
+    """строки вместе с рассчитанной зп; для EmployeeTable — из типизированных колонок"""
+    if isinstance(rows, EmployeeTable):
+        for i in range(len(rows)):
+            yield rows.row(i), rows.salary(i)
+    else:
+        for row in rows:
+            yield row, calculate_salary(row)
+
+
 class EmployeeData:
-    def __init__(self, files: List[str]):
+    def __init__(self, files: List[str], chunk_size: int = CHUNK_SIZE, workers: int = 1, cache=None,
+                 dedupe_by: Tuple[str, ...] = (), on_conflict: str = 'first', io_concurrency: int = 0,
+                 mmap_csv: bool = False, columns: Optional[Iterable[str]] = None):
+        if chunk_size < 1:
+            raise ValueError(f"Размер блока должен быть положительным числом, получено: {chunk_size}")
+        if workers < 1:
+            raise ValueError(f"Количество процессов должно быть не меньше 1, получено: {workers}")
+        if io_concurrency < 0:
+            raise ValueError(f"Число одновременных чтений не может быть отрицательным, получено: {io_concurrency}")
         self.files = files
+        self.chunk_size = chunk_size
+        self.workers = workers  # > 1 — разбор файлов в пуле процессов
+        self.io_concurrency = io_concurrency  # > 0 — асинхронная проверка и чтение файлов (медленные/сетевые диски)
+        self.mmap_csv = mmap_csv  # CSV читаются через mmap, декодируются только нужные колонки
+        self.cache = cache  # ParsedFileCache: повторный запуск по неизмененным файлам не разбирает их
+        self.dedupe_by = tuple(dedupe_by)  # поля для слияния повторов одного сотрудника: id и/или email
+        self.on_conflict = on_conflict
+        if any(field not in DEDUPE_FIELDS for field in self.dedupe_by):
+            raise ValueError(f"Слияние возможно только по полям: {', '.join(DEDUPE_FIELDS)}")
+        if on_conflict not in CONFLICT_POLICIES:
+            raise ValueError(f"Неверная политика конфликтов: '{on_conflict}'. "
+                             f"Доступные политики: {', '.join(CONFLICT_POLICIES)}")
+        self.fields = self.project_fields(columns)  # поля, которые читатели оставляют в строках
         self.data = []
 
+    def project_fields(self, columns: Optional[Iterable[str]]) -> Tuple[str, ...]:
+        """нужные поля в порядке FIELD_ORDER вместе с полями, без которых не работает слияние"""
+        if columns is None or self.cache is not None:
+            return FIELD_ORDER  # таблицы в кэше хранятся целиком: их читают и другие отчеты
+        needed = set(columns)
+        unknown = needed - _FIELD_SET
+        if unknown:
+            raise ValueError(f"Неизвестные поля: {', '.join(sorted(unknown))}. "
+                             f"Доступные поля: {', '.join(FIELD_ORDER)}")
+        needed.update(self.dedupe_by)
+        if self.on_conflict == 'sum_hours' and self.dedupe_by:
+            needed.add('hours_worked')
+        return tuple(field for field in FIELD_ORDER if field in needed)
+
     def validate_files(self):
         """проверка существования файлов"""
-        invalid_files = [file for file in self.files if not os.path.exists(file)]
+        if self.io_concurrency > 0:
+            from .async_io import missing_files
+            invalid_files = missing_files(self.files, self.io_concurrency)
+        else:
+            invalid_files = [file for file in self.files if not os.path.exists(file)]
         if invalid_files:
             raise FileNotFoundError(f"Следующие файлы не найдены: {', '.join(invalid_files)}")
 
-    def read_and_standardize_csv(self, file_path: str) -> List[Dict[str, str]]:
-        """чтение и стандартизация данных из CSV"""
+    def iter_standardized_csv(self, file_path: str) -> Iterator[Dict[str, str]]:
+        """потоковое чтение CSV: строки стандартизируются и отдаются по одной"""
+        if self.mmap_csv:
+            from .mmap_csv import iter_mmap_csv
+            yield from iter_mmap_csv(file_path, fields=self.fields, block_size=self.chunk_size)
+            return
         with open(file_path, 'r') as file:
-            lines = file.readlines()
+            yield from self.standardize_lines(iter_lines(file, self.chunk_size))
 
-        raw_headers = lines[0].strip().split(',')
-        headers_mapping = standardize_headers(raw_headers)
+    def standardize_lines(self, lines: Iterator[str]) -> Iterator[Dict[str, str]]:
+        """стандартизация строк CSV, первая строка — заголовки"""
+        header_line = next(lines, None)
+        if header_line is None:
+            return
 
-        data = []
-        for line in lines[1:]:
-            values = line.strip().split(',')
-            row_dict = {}
-            for i, value in enumerate(values):
-                for standard_key, original_header in headers_mapping.items():
-                    if raw_headers[i].lower() == original_header.lower():
-                        row_dict[standard_key] = value
+        raw_headers = header_line.strip().split(',')
+        headers_mapping = standardize_headers(raw_headers)
+        build_row = make_row_builder(compile_projection(raw_headers, headers_mapping), self.fields)
 
-            for key in ['id', 'email', 'name', 'department', 'hours_worked', 'hourly_rate']:
-                if key not in row_dict:
-                    row_dict[key] = ''
-            data.append(row_dict)
+        for line in lines:
+            yield build_row(line.strip().split(','))
 
-        return data
+    def read_and_standardize_csv(self, file_path: str) -> List[Dict[str, str]]:
+        """чтение и стандартизация данных из CSV"""
+        return list(self.iter_standardized_csv(file_path))
 
-    def read_and_standardize_json(self, file_path: str) -> List[Dict[str, str]]:
-        """чтение и стандартизация данных из JSON"""
+    def iter_standardized_json(self, file_path: str) -> Iterator[Dict[str, str]]:
+        """потоковое чтение JSON-массива: объекты разбираются и стандартизируются по одному"""
         with open(file_path, 'r') as file:
-            records = json.load(file)
+            yield from self.standardize_records(iter_json_array(file, self.chunk_size), file_path)
 
-        if not isinstance(records, list):
-            raise ValueError(f"Файл {file_path} должен содержать список объектов JSON.")
-
-        headers = list(records[0].keys())
-        headers_mapping = standardize_headers(headers)
+    def iter_standardized_jsonl(self, file_path: str) -> Iterator[Dict[str, str]]:
+        """потоковое чтение JSON Lines: один объект на строку"""
+        with open(file_path, 'r') as file:
+            yield from self.standardize_records(iter_json_lines(file, self.chunk_size), file_path)
 
-        data = []
+    def standardize_records(self, records: Iterable[object], file_path: str) -> Iterator[Dict[str, str]]:
+        """стандартизация JSON-объектов; маппинг заголовков строится один раз на набор ключей"""
+        mappings: Dict[Tuple[str, ...], Tuple[Tuple[str, str], ...]] = {}
+        fields_set = set(self.fields)
         for item in records:
-            row_dict = {}
-            for standard_key, original_header in headers_mapping.items():
-                row_dict[standard_key] = str(item.get(original_header, ''))
-            for key in ['id', 'email', 'name', 'department', 'hours_worked', 'hourly_rate']:
-                if key not in row_dict:
-                    row_dict[key] = ''
-            data.append(row_dict)
+            if not isinstance(item, dict):
+                raise ValueError(f"Файл {file_path} должен содержать список объектов JSON.")
+
+            keys = tuple(item)
+            fields = mappings.get(keys)
+            if fields is None:
+                if len(mappings) >= KEY_SET_CACHE_SIZE:
+                    mappings.clear()
+                original_keys = {key.lower(): key for key in keys}
+                headers_mapping = standardize_headers(list(keys))
+                fields = mappings[keys] = tuple(
+                    (standard_key, original_keys[original_header])
+                    for standard_key, original_header in headers_mapping.items()
+                    if standard_key in fields_set
+                )
+
+            row_dict = dict.fromkeys(self.fields, '')
+            for standard_key, key in fields:
+                row_dict[standard_key] = str(item[key])
+            yield row_dict
 
-        return data
+    def read_and_standardize_json(self, file_path: str) -> List[Dict[str, str]]:
+        """чтение и стандартизация данных из JSON"""
+        return list(self.iter_standardized_json(file_path))
+
+    def iter_file(self, file_path: str) -> Iterator[Dict[str, str]]:
+        """стандартизированные строки одного файла"""
+        ext = os.path.splitext(file_path)[-1].lower()
+        if ext == '.csv':
+            return self.iter_standardized_csv(file_path)
+        if ext == '.json':
+            return self.iter_standardized_json(file_path)
+        if ext == '.jsonl':
+            return self.iter_standardized_jsonl(file_path)
+        raise ValueError(f"Неподдерживаемый формат файла: {file_path}")
+
+    def iter_stream(self, file_path: str, stream: TextIO) -> Iterator[Dict[str, str]]:
+        """стандартизированные строки уже открытого файла; читается потоково, блоками chunk_size"""
+        ext = os.path.splitext(file_path)[-1].lower()
+        if ext == '.csv':
+            if self.mmap_csv:  # отображение строится по пути: открытый файл не читается
+                from .mmap_csv import iter_mmap_csv
+                return iter_mmap_csv(file_path, fields=self.fields, block_size=self.chunk_size)
+            return self.standardize_lines(iter_lines(stream, self.chunk_size))
+        if ext == '.json':
+            return self.standardize_records(iter_json_array(stream, self.chunk_size), file_path)
+        if ext == '.jsonl':
+            return self.standardize_records(iter_json_lines(stream, self.chunk_size), file_path)
+        raise ValueError(f"Неподдерживаемый формат файла: {file_path}")
+
+    def read_table(self, file_path: str) -> EmployeeTable:
+        """таблица одного файла: из кэша, если он задан и файл не менялся"""
+        if self.cache is None:
+            return EmployeeTable.from_rows(self.iter_file(file_path))
+        key = self.cache.key(file_path)
+        table = self.cache.get(file_path, key)
+        if table is None:
+            table = EmployeeTable.from_rows(self.iter_file(file_path))
+            self.cache.put(file_path, table, key)
+        return table
+
+    def iter_rows(self) -> Iterator[Dict[str, str]]:
+        """ленивое чтение всех файлов: строки отдаются по мере разбора"""
+        if self.dedupe_by:
+            return self.merge_rows(self.iter_source_rows())
+        return self.iter_source_rows()
+
+    def iter_source_rows(self) -> Iterator[Dict[str, str]]:
+        """строки всех файлов без слияния повторов"""
+        if self.workers > 1:
+            from .parallel import iter_rows_parallel
+            yield from iter_rows_parallel(self)
+            return
+        if self.io_concurrency > 0:
+            from .async_io import iter_rows_async
+            yield from iter_rows_async(self)
+            return
+
+        for file in self.files:
+            if self.cache is not None:
+                yield from self.read_table(file)
+            else:
+                yield from self.iter_file(file)
 
     def process_multiple_files(self) -> List[Dict[str, str]]:
         """обработка CSV и JSON файлов"""
-        all_data = []
+        return list(self.iter_rows())
+
+    def load_table(self) -> EmployeeTable:
+        """обработка CSV и JSON файлов в колоночную таблицу"""
+        if self.dedupe_by:
+            return EmployeeTable.from_rows(self.iter_rows())
+        if self.workers > 1:
+            from .parallel import load_table_parallel
+            return load_table_parallel(self)
+        if self.cache is None or self.io_concurrency > 0:
+            return EmployeeTable.from_rows(self.iter_rows())
+        table = EmployeeTable()
         for file in self.files:
-            ext = os.path.splitext(file)[-1].lower()
-            if ext == '.csv':
-                data = self.read_and_standardize_csv(file)
-            elif ext == '.json':
-                data = self.read_and_standardize_json(file)
+            table.extend(self.read_table(file))
+        return table
+
+    def merge_rows(self, rows: Iterable[Dict[str, str]]) -> Iterator[Dict[str, str]]:
+        """слияние повторов одного сотрудника из разных выгрузок за один проход
+
+        Строки совпадают, если совпадает любое из полей dedupe_by (email — без учета регистра,
+        пустые значения не сравниваются). Политика on_conflict: 'first' — остается первая строка,
+        'last' — последняя, 'sum_hours' — первая строка с суммой отработанных часов. Порядок — по первому
+        появлению. С 'first' строка отдается сразу, в памяти только индекс ключей; 'last' и 'sum_hours'
+        держат все слитые строки до конца потока, поэтому сводные отчеты с ними занимают O(сотрудников)
+        памяти. Строка, совпавшая по разным полям с разными сотрудниками, сливается с первым
+        совпадением, о таких строках выводится предупреждение в stderr.
+        """
+        streaming = self.on_conflict == 'first'
+        merged: List[Dict[str, str]] = []
+        count = 0
+        indexes: Dict[str, Dict[str, int]] = {field: {} for field in self.dedupe_by}
+        conflicts: List[str] = []
+
+        for row in rows:
+            keys = [(field, _dedupe_key(field, row.get(field, ''))) for field in self.dedupe_by]
+            matches = [indexes[field].get(key) for field, key in keys if key]
+            positions = [match for match in matches if match is not None]
+            if len(set(positions)) > 1:
+                conflicts.append('/'.join(f"{field}={row.get(field, '')}" for field in self.dedupe_by))
+
+            if not positions:
+                position = count
+                count += 1
+                if streaming:
+                    yield row
+                else:
+                    merged.append(row)
             else:
-                raise ValueError(f"Неподдерживаемый формат файла: {file}")
-            all_data.extend(data)
-        return all_data
+                position = positions[0]
+                if self.on_conflict == 'last':
+                    merged[position] = row
+                elif self.on_conflict == 'sum_hours':
+                    merged[position] = _sum_hours(merged[position], row)
+
+            for field, key in keys:
+                if key:
+                    indexes[field].setdefault(key, position)
+
+        yield from merged
+        warn_merge_conflicts(conflicts)
 
-    def group_by(self, data: List[Dict[str, str]], key: str) -> Dict[str, List[Dict[str, str]]]:
+    def group_by(self, data: Iterable[Dict[str, str]], key: str) -> Dict[str, List[Dict[str, str]]]:
         """группировка данных по ключу"""
+        if isinstance(data, EmployeeTable):
+            return data.group_by(key)
         grouped_data = {}
         for row in data:
             group_value = row[key]
@@ -126,77 +474,247 @@ class EmployeeData:
 
 
 class ReportGenerator:
-    def __init__(self, data: List[Dict[str, str]]):
+    # поля, которые читает каждый отчет; остальные колонки читатели не разбирают
+    REPORT_COLUMNS = {
+        'payout': FIELD_ORDER,
+        'average_hourly_rate': ('id', 'department', 'hours_worked', 'hourly_rate'),
+        'department_summary': ('id', 'department', 'hours_worked', 'hourly_rate'),
+        'top_earners': FIELD_ORDER,
+        'salary_range': FIELD_ORDER,
+        'rate_statistics': ('id', 'department', 'hourly_rate'),
+    }
+    # эти отчеты считаются за один проход по потоку строк и не требуют общей сортировки
+    STREAMING_REPORTS = ('average_hourly_rate', 'department_summary', 'top_earners')
+    # сводные отчеты, которые собираются из сохраненных агрегатов файлов (--incremental)
+    INCREMENTAL_REPORTS = ('average_hourly_rate', 'department_summary')
+    # отчеты по колоночной таблице без общей сортировки
+    UNSORTED_TABLE_REPORTS = ('salary_range',)
+    DEFAULT_LIMIT = 10
+    PAYOUT_COLUMNS = ('id', 'name', 'email', 'hours_worked', 'hourly_rate', 'salary')
+    SUMMARY_COLUMNS = ('employees', 'total_hours', 'total_payout', 'average_hourly_rate')
+
+    def __init__(self, data: Iterable[Dict[str, str]], presorted: bool = False,
+                 writer: Optional[ReportWriter] = None, options: Optional[Dict[str, object]] = None,
+                 order_by_id: bool = False):
         self.data = data
+        self.presorted = presorted  # данные уже отсортированы по id (sorting_data)
+        # отделы — как после сортировки по id (разбирает id); по умолчанию — в порядке первого появления
+        self.order_by_id = order_by_id and not presorted
+        self.writer = writer if writer is not None else ReportWriter()
+        self.options = options or {}  # параметры отчетов: limit, min_salary, max_salary, percentiles, numeric_backend
         self.employee_data = EmployeeData([])
+        self._salary_index = None
 
         self.available_reports = {
             'payout': self.generate_payout_report,
-            'average_hourly_rate': self.generate_average_hourly_rate_report
+            'average_hourly_rate': self.generate_average_hourly_rate_report,
+            'department_summary': self.generate_department_summary_report,
+            'top_earners': self.generate_top_earners_report,
+            'salary_range': self.generate_salary_range_report,
+            'rate_statistics': self.generate_rate_statistics_report
         }
 
     def get_available_reports(self) -> List[str]:
         return list(self.available_reports.keys())
 
+    @classmethod
+    def report_columns(cls, report_type: str) -> Tuple[str, ...]:
+        """поля, нужные отчету (для неизвестного отчета — все поля)"""
+        return cls.REPORT_COLUMNS.get(report_type, FIELD_ORDER)
+
     def run_report(self, report_type: str) -> None:
         report_func = self.available_reports.get(report_type)
         if report_func:
-            report_func()
+            try:
+                report_func()
+            finally:
+                self.writer.flush()
         else:
             raise ValueError(f"Неверный тип отчета: '{report_type}'. "
                              f"Доступные отчеты: {', '.join(self.get_available_reports())}")
 
-    def generate_payout_report(self):
+    def payout_sections(self) -> Iterator[Tuple[str, Iterator[Dict[str, object]]]]:
+        """сотрудники по отделам вместе с рассчитанной зп"""
         grouped_data = self.employee_data.group_by(self.data, 'department')
         for department, rows in grouped_data.items():
-            print(f"Department: {department}")
-            print('-' * 150)
-            print(f"{'ID':<5} {'Name':<25} {'Email':<25} {'Hours Worked':<15} {'Hourly Rate':<15} {'Salary':<10}")
-            print('-' * 105)
-            for row in sorted(rows, key=lambda x: int(x['id'])):
-                salary = calculate_salary(row)
-                print(f"{row['id']:<5} {row['name']:<25} {row['email']:<25} "
-                      f"{row['hours_worked']:<15} {row['hourly_rate']:<15} {salary:<10}")
-            print('\n' + '-' * 150 + '\n')
+            if not self.presorted:
+                rows = sorting_data(rows)
+            yield department, (dict(row, salary=salary) for row, salary in iter_salaries(rows))
+
+    def generate_payout_report(self):
+        self.writer.write_report(self.PAYOUT_COLUMNS, self.payout_sections(), render_payout_text)
+
+    def aggregate_departments(self) -> DepartmentAggregator:
+        """агрегация показателей по отделам за один проход"""
+        if isinstance(self.data, DepartmentAggregator):  # уже собрано (инкрементальный режим)
+            return self.data
+        aggregator = DepartmentAggregator(order_by_id=self.order_by_id)
+        if isinstance(self.data, EmployeeTable):
+            return aggregator.consume_table(self.data)
+        return aggregator.consume(self.data)
+
+    def summary_sections(self) -> Iterator[Tuple[str, Tuple[Dict[str, object]]]]:
+        """сводные показатели отделов: по одной записи на отдел"""
+        for department, stats in self.aggregate_departments().items():
+            yield department, ({
+                'employees': stats.employees,
+                'total_hours': stats.hours_total,
+                'total_payout': stats.payout_total,
+                'average_hourly_rate': stats.average_rate,
+            },)
 
     def generate_average_hourly_rate_report(self):
         """генерация отчета по средней почасовой ставке"""
-        grouped_data = self.employee_data.group_by(self.data, 'department')
-        for department, rows in grouped_data.items():
-            print(f"Department: {department}")
-            print('-' * 150)
-            hourly_rates = []
-            for row in rows:
-                try:
-                    rate = float(row['hourly_rate'])
-                    hourly_rates.append(rate)
-                except (ValueError, TypeError):
-                    continue
-            if hourly_rates:
-                average_rate = sum(hourly_rates) / len(hourly_rates)
-                print(f"Average Hourly Rate: {average_rate:.2f}")
-            else:
-                print("No data available for average hourly rate.")
-            print('-' * 150 + '\n')
-
-
-def main(files: List[str], report_type: str) -> None:
+        self.writer.write_report(('average_hourly_rate',), self.summary_sections(), render_average_rate_text)
+
+    def generate_department_summary_report(self):
+        """сводка по отделам: сотрудники, часы, фонд оплаты и средняя ставка"""
+        self.writer.write_report(self.SUMMARY_COLUMNS, self.summary_sections(), render_department_summary_text)
+
+    def generate_top_earners_report(self):
+        """сотрудники с наибольшей зп в каждом отделе (параметр limit)"""
+        limit = self.options.get('limit')
+        limit = self.DEFAULT_LIMIT if limit is None else int(limit)
+        if limit < 1:
+            raise ValueError("Параметр limit должен быть положительным числом.")
+        from .queries import top_earners
+        self.writer.write_report(self.PAYOUT_COLUMNS, top_earners(self.data, limit, self.order_by_id), render_payout_text)
+
+    def salary_index(self) -> 'SalaryIndex':
+        """индекс зарплат по отделам, строится один раз для всех запросов по диапазону"""
+        if self._salary_index is None:
+            from .queries import SalaryIndex
+            self._salary_index = SalaryIndex(self.data, self.order_by_id)
+        return self._salary_index
+
+    def generate_salary_range_report(self):
+        """сотрудники с зп в диапазоне [min_salary, max_salary] по отделам"""
+        min_salary, max_salary = self.options.get('min_salary'), self.options.get('max_salary')
+        if min_salary is not None and max_salary is not None and min_salary > max_salary:
+            raise ValueError("Нижняя граница зарплаты больше верхней.")
+        sections = self.salary_index().salary_range(min_salary, max_salary)
+        self.writer.write_report(self.PAYOUT_COLUMNS, sections, render_payout_text)
+
+    def generate_rate_statistics_report(self):
+        """медиана, перцентили и стандартное отклонение ставки по отделам (NumPy, если установлен)"""
+        from .numeric import DEFAULT_PERCENTILES, percentile_column, rate_statistics
+        percentiles = self.options.get('percentiles') or DEFAULT_PERCENTILES
+        sections = rate_statistics(self.data, percentiles, self.options.get('numeric_backend') or 'auto')
+        columns = (('employees', 'mean_hourly_rate', 'median_hourly_rate')
+                   + tuple(percentile_column(percentile) for percentile in percentiles) + ('stddev_hourly_rate',))
+        self.writer.write_report(columns, ((department, (record,)) for department, record in sections),
+                                 render_rate_statistics_text)
+
+
+def warn_duplicates(duplicates: List[int]) -> None:
+    """предупреждение в stderr о повторяющихся id"""
+    if duplicates:
+        shown = ', '.join(map(str, duplicates[:DUPLICATES_SHOWN]))
+        more = f" и еще {len(duplicates) - DUPLICATES_SHOWN}" if len(duplicates) > DUPLICATES_SHOWN else ''
+        print(f"Внимание: повторяющиеся id в данных: {shown}{more}", file=sys.stderr)
+
+
+def warn_merge_conflicts(conflicts: List[str]) -> None:
+    """предупреждение в stderr о строках, совпавших по разным полям с разными сотрудниками"""
+    if conflicts:
+        shown = ', '.join(conflicts[:DUPLICATES_SHOWN])
+        more = f" и еще {len(conflicts) - DUPLICATES_SHOWN}" if len(conflicts) > DUPLICATES_SHOWN else ''
+        print(f"Внимание: строки совпадают с разными сотрудниками по разным полям "
+              f"и слиты с первым совпадением: {shown}{more}", file=sys.stderr)
+
+
+def parse_percentiles(text: Optional[str]) -> Optional[Tuple[float, ...]]:
+    """'25,75,90' -> (25.0, 75.0, 90.0)"""
+    if not text:
+        return None
     try:
-        employee_data = EmployeeData(files)
-        employee_data.validate_files()
-        all_data = employee_data.process_multiple_files()
-        sorted_data = sorting_data(all_data)
-
-        report_generator = ReportGenerator(sorted_data)
-        report_generator.run_report(report_type)
+        return tuple(float(part) for part in text.split(',') if part.strip())
+    except ValueError:
+        raise ValueError(f"Перцентили задаются числами через запятую, получено: '{text}'") from None
+
+
+def main(files: List[str], report_type: str, chunk_size: int = CHUNK_SIZE, workers: int = 1,
+         cache_dir: Optional[str] = None, cache_size: Optional[int] = None,
+         header_aliases: Optional[List[str]] = None, output: Optional[str] = None,
+         output_format: str = 'text', limit: Optional[int] = None, min_salary: Optional[float] = None,
+         max_salary: Optional[float] = None, profile: Optional[str] = None,
+         dedupe_by: Optional[str] = None, on_conflict: str = 'first', io_concurrency: int = 0,
+         mmap_csv: bool = False, percentiles: Optional[str] = None, numeric_backend: str = 'auto',
+         incremental_dir: Optional[str] = None) -> int:
+    """построение отчета; возвращает код завершения: 0 — успех, 1 — ошибка (сообщение в stderr)"""
+    profiler = NULL_PROFILER
+    if profile:
+        from .profiling import StageProfiler
+        profiler = StageProfiler()
+    profiler.start()
+    try:
+        for header_alias in header_aliases or []:
+            standard_field, separator, alias = header_alias.partition('=')
+            if not separator:
+                raise ValueError(f"Синоним заголовка задается как ПОЛЕ=СИНОНИМ, получено: '{header_alias}'")
+            register_header_alias(standard_field.strip(), alias)
+        cache = None
+        if cache_dir:
+            from .cache import CACHE_SIZE, ParsedFileCache
+            cache = ParsedFileCache(cache_dir, cache_size if cache_size is not None else CACHE_SIZE)
+        dedupe_fields = tuple(field.strip() for field in dedupe_by.split(',') if field.strip()) if dedupe_by else ()
+        employee_data = EmployeeData(files, chunk_size=chunk_size, workers=workers, cache=cache,
+                                     dedupe_by=dedupe_fields, on_conflict=on_conflict,
+                                     io_concurrency=io_concurrency, mmap_csv=mmap_csv,
+                                     columns=ReportGenerator.report_columns(report_type))
+        if incremental_dir and report_type not in ReportGenerator.INCREMENTAL_REPORTS:
+            raise ValueError(f"Инкрементальный режим (--incremental) поддерживают только отчеты: "
+                             f"{', '.join(ReportGenerator.INCREMENTAL_REPORTS)}")
+        with profiler.stage('validate_files', rows=len(files)):
+            employee_data.validate_files()
+        with open(output, 'w') if output else nullcontext() as stream:
+            writer = ReportWriter(stream, output_format=output_format)
+            options = {'limit': limit, 'min_salary': min_salary, 'max_salary': max_salary,
+                       'percentiles': parse_percentiles(percentiles), 'numeric_backend': numeric_backend}
+            if incremental_dir:
+                # пересчитываются только измененные файлы, остальные агрегаты читаются с диска
+                from .incremental import PartialAggregateStore
+                with profiler.stage('process_multiple_files') as stage:
+                    aggregator = PartialAggregateStore(incremental_dir).aggregate(employee_data)
+                if profiler.enabled:
+                    stage.rows = aggregator.rows
+                report_generator = ReportGenerator(aggregator, writer=writer, options=options)
+                with profiler.stage('run_report', rows=aggregator.rows):
+                    report_generator.run_report(report_type)
+            elif report_type in ReportGenerator.STREAMING_REPORTS:
+                # сводные отчеты агрегируются прямо из потока читателей;
+                # время чтения учитывается отдельно от времени отчета
+                rows = profiler.timed_iter('process_multiple_files', employee_data.iter_rows())
+                report_generator = ReportGenerator(rows, writer=writer, options=options, order_by_id=True)
+                with profiler.stage('run_report') as stage:
+                    report_generator.run_report(report_type)
+                if profiler.enabled:
+                    stage.rows = profiler.record('process_multiple_files').rows
+            else:
+                with profiler.stage('process_multiple_files') as stage:
+                    table = employee_data.load_table()
+                if profiler.enabled:
+                    stage.rows = len(table)
+                if report_type in ReportGenerator.UNSORTED_TABLE_REPORTS:
+                    report_generator = ReportGenerator(table, writer=writer, options=options, order_by_id=True)
+                else:
+                    # построчные отчеты работают с компактной колоночной таблицей
+                    duplicates = []
+                    with profiler.stage('sorting_data', rows=len(table)):
+                        table = sorting_data(table, duplicates)
+                    warn_duplicates(duplicates)
+                    report_generator = ReportGenerator(table, presorted=True, writer=writer, options=options)
+                with profiler.stage('run_report', rows=len(table)):
+                    report_generator.run_report(report_type)
     except Exception as e:
-        print(f"\n Произошла ошибка: {str(e)}")
+        print(f"\n Произошла ошибка: {str(e)}", file=sys.stderr)
+        return 1
+    finally:
+        profiler.stop()
+        profiler.emit(profile or 'text')
+    return 0
 
 
 if __name__ == '__main__':
-    parser = argparse.ArgumentParser(description="Скрипт для генерации отчетов по CSV/JSON")
-    parser.add_argument('files', metavar='F', type=str, nargs='+', help="Список файлов")
-    parser.add_argument('--report', type=str, required=True,
-                        help="Тип отчета (например, 'payout', 'average_hourly_rate')")
-    args = parser.parse_args()
-    main(args.files, args.report)
+    from .cli import main as cli_main
+    sys.exit(cli_main())
@@ -0,0 +1,57 @@
+import locale
+import mmap
+import os
+from typing import Dict, Iterator, Optional, Sequence
+
+from .headers import standardize_headers
+from .main import compile_projection, make_row_builder
+from .table import FIELD_ORDER
+
+MMAP_BLOCK_SIZE = 1 << 20  # размер блока, который декодируется и режется на строки за один вызов (байт)
+
+
+def iter_line_blocks(mapped: mmap.mmap, start: int, end: int, block_size: int = MMAP_BLOCK_SIZE) -> Iterator[bytes]:
+    """блоки [start, end), которые заканчиваются на границе строки"""
+    position = start
+    while position < end:
+        block_end = min(position + block_size, end)
+        if block_end < end:
+            line_end = mapped.rfind(b'\n', position, block_end)
+            if line_end < 0:  # строка длиннее блока
+                line_end = mapped.find(b'\n', block_end, end)
+            block_end = end if line_end < 0 else line_end + 1
+        yield mapped[position:block_end]
+        position = block_end
+
+
+def iter_mmap_csv(file_path: str, start: Optional[int] = None, end: Optional[int] = None,
+                  fields: Optional[Sequence[str]] = None,
+                  block_size: int = MMAP_BLOCK_SIZE) -> Iterator[Dict[str, str]]:
+    """стандартизация CSV через mmap: файл не копируется в память целиком
+
+    Границы строк ищутся в байтах отображения, поэтому start и end — произвольный байтовый
+    диапазон строк данных (см. parallel.split_csv_ranges), по умолчанию — весь файл после
+    заголовков. Строки разделяются '\\n' (или '\\r\\n'). fields — нужные поля: в словарь строки
+    попадают только их колонки (по умолчанию — все стандартные поля).
+    """
+    fields = tuple(fields) if fields is not None else FIELD_ORDER
+    encoding = locale.getpreferredencoding(False)  # та же кодировка, что у open() в текстовом режиме
+    with open(file_path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            header_end = mapped.find(b'\n')
+            if header_end < 0:
+                header_end = len(mapped)
+            raw_headers = mapped[:header_end].decode(encoding).strip().split(',')
+            build_row = make_row_builder(compile_projection(raw_headers, standardize_headers(raw_headers)), fields)
+
+            start = header_end + 1 if start is None else start
+            end = len(mapped) if end is None else end
+            for block in iter_line_blocks(mapped, start, end, block_size):
+                # блок целиком декодируется одним вызовом: это дешевле, чем декодировать каждое поле
+                lines = block.decode(encoding).split('\n')
+                if not lines[-1]:  # блок заканчивается переводом строки
+                    lines.pop()
+                for line in lines:
+                    yield build_row(line.strip().split(','))
@@ -0,0 +1,195 @@
+import math
+from array import array
+from collections import Counter
+from functools import reduce
+from operator import add
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .table import EmployeeTable
+
+NUMERIC_BACKENDS = ('auto', 'numpy', 'python')
+DEFAULT_PERCENTILES = (25.0, 75.0, 90.0)
+
+RateColumns = Tuple[List[str], List[int], array, array]
+
+
+def load_numpy():
+    """модуль numpy или None, если он не установлен"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def resolve_backend(name: str = 'auto') -> str:
+    """'numpy' или 'python': auto выбирает NumPy, если он установлен"""
+    if name not in NUMERIC_BACKENDS:
+        raise ValueError(f"Неверный вычислитель: '{name}'. Доступные: {', '.join(NUMERIC_BACKENDS)}")
+    if name == 'python':
+        return name
+    if load_numpy() is None:
+        if name == 'numpy':
+            raise ValueError("NumPy не установлен: используйте --numeric-backend python или auto")
+        return 'python'
+    return 'numpy'
+
+
+def _finite(text: str) -> Optional[float]:
+    try:
+        value = float(text)
+    except (ValueError, TypeError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def rate_columns(data: Iterable[Dict[str, str]]) -> RateColumns:
+    """отделы в порядке первого появления, число сотрудников в них и пары (код отдела, ставка)
+
+    В пары попадают только строки с конечной числовой ставкой; коды отделов — позиции в списке отделов.
+    """
+    if isinstance(data, EmployeeTable):
+        categories = data.departments.categories
+        order = list(dict.fromkeys(data.departments.codes))
+        remap = [0] * len(categories)
+        for position, code in enumerate(order):
+            remap[code] = position
+        codes = array('I', map(remap.__getitem__, data.departments.codes))
+        rates = array('d', data.rates.values)
+        invalid = set()
+        for i, text in data.rates.raw.items():
+            value = _finite(text)
+            if value is None:
+                invalid.add(i)
+            else:
+                rates[i] = value
+        counter = Counter(codes)
+        employees = [counter[position] for position in range(len(order))]
+        if invalid:
+            valid = [i for i in range(len(codes)) if i not in invalid]
+            codes = array('I', [codes[i] for i in valid])
+            rates = array('d', [rates[i] for i in valid])
+        return [categories[code] for code in order], employees, codes, rates
+
+    index: Dict[str, int] = {}
+    employees = []
+    codes = array('I')
+    rates = array('d')
+    for row in data:
+        department = row['department']
+        code = index.get(department)
+        if code is None:
+            code = index[department] = len(employees)
+            employees.append(0)
+        employees[code] += 1
+        value = _finite(row['hourly_rate'])
+        if value is not None:
+            codes.append(code)
+            rates.append(value)
+    return list(index), employees, codes, rates
+
+
+def _interpolate(ordered: Sequence[float], percentile: float) -> float:
+    """линейная интерполяция между соседними значениями (метод 'linear' в NumPy)"""
+    position = (len(ordered) - 1) * (percentile / 100.0)
+    low = math.floor(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def _reduce_python(groups: int, codes: array, rates: array, percentiles: Sequence[float]) -> List[Dict[str, float]]:
+    grouped = [array('d') for _ in range(groups)]
+    for code, rate in zip(codes, rates):
+        grouped[code].append(rate)
+
+    results = []
+    for values in grouped:
+        count = len(values)
+        if not count:
+            results.append({})
+            continue
+        # суммы — последовательно в порядке строк, как у np.bincount: результаты бэкендов совпадают
+        mean = reduce(add, values, 0.0) / count
+        variance = reduce(add, [(value - mean) * (value - mean) for value in values], 0.0) / count
+        ordered = sorted(values)
+        stats = {'mean': mean, 'stddev': math.sqrt(variance)}
+        for percentile in percentiles:
+            stats[percentile] = _interpolate(ordered, percentile)
+        results.append(stats)
+    return results
+
+
+def _reduce_numpy(groups: int, codes: array, rates: array, percentiles: Sequence[float]) -> List[Dict[str, float]]:
+    np = load_numpy()
+    codes = np.frombuffer(codes, dtype=np.dtype(codes.typecode)).astype(np.intp) if len(codes) else np.zeros(0, np.intp)
+    rates = np.frombuffer(rates, dtype=np.float64) if len(rates) else np.zeros(0)
+
+    counts = np.bincount(codes, minlength=groups)
+    present = counts > 0
+    means = np.zeros(groups)
+    means[present] = np.bincount(codes, weights=rates, minlength=groups)[present] / counts[present]
+    deviations = rates - means[codes]
+    variances = np.zeros(groups)
+    variances[present] = np.bincount(codes, weights=deviations * deviations, minlength=groups)[present] / counts[present]
+    stddevs = np.sqrt(variances)
+
+    # ставки раскладываются по группам устойчивой поразрядной сортировкой кодов (для uint16 — radix),
+    # затем каждая группа сортируется на месте: это быстрее lexsort по двум ключам
+    sort_codes = codes.astype(np.uint16) if groups <= 1 << 16 else codes
+    ordered = rates[np.argsort(sort_codes, kind='stable')]
+    bounds = np.cumsum(counts)
+    starts = bounds - counts
+    groups_present = np.flatnonzero(present)
+    for start, end in zip(starts[groups_present].tolist(), bounds[groups_present].tolist()):
+        ordered[start:end].sort()
+    group_starts, group_counts = starts[groups_present], counts[groups_present]
+    quantiles = {}
+    for percentile in percentiles:
+        # позиция внутри группы — той же формулой, что и в _interpolate
+        position = (group_counts - 1) * (percentile / 100.0)
+        offset = np.floor(position)
+        low = group_starts + offset.astype(np.intp)
+        high = np.minimum(low + 1, group_starts + group_counts - 1)
+        quantiles[percentile] = ordered[low] + (ordered[high] - ordered[low]) * (position - offset)
+
+    results = [{} for _ in range(groups)]
+    for i, group in enumerate(groups_present.tolist()):
+        stats = {'mean': float(means[group]), 'stddev': float(stddevs[group])}
+        for percentile in percentiles:
+            stats[percentile] = float(quantiles[percentile][i])
+        results[group] = stats
+    return results
+
+
+def percentile_column(percentile: float) -> str:
+    return f"p{percentile:g}_hourly_rate"
+
+
+def rate_statistics(data: Iterable[Dict[str, str]], percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+                    backend: str = 'auto') -> List[Tuple[str, Dict[str, object]]]:
+    """статистика почасовой ставки по отделам: среднее, медиана, перцентили, стандартное отклонение
+
+    Ставки собираются в плоские массивы (код отдела, ставка) и сворачиваются пакетно:
+    в NumPy — через bincount и одну сортировку, без NumPy — по массивам array.
+    Нечисловые и бесконечные ставки не учитываются; стандартное отклонение — по генеральной совокупности.
+    """
+    for percentile in percentiles:
+        if not 0 <= percentile <= 100:
+            raise ValueError(f"Перцентиль должен быть в диапазоне 0..100, получено: {percentile:g}")
+    departments, employees, codes, rates = rate_columns(data)
+    needed = tuple(dict.fromkeys((50.0,) + tuple(percentiles)))
+    reducer = _reduce_numpy if resolve_backend(backend) == 'numpy' else _reduce_python
+    results = reducer(len(departments), codes, rates, needed)
+
+    sections = []
+    for department, count, stats in zip(departments, employees, results):
+        record = {
+            'employees': count,
+            'mean_hourly_rate': stats.get('mean'),
+            'median_hourly_rate': stats.get(50.0),
+        }
+        for percentile in percentiles:
+            record[percentile_column(percentile)] = stats.get(percentile)
+        record['stddev_hourly_rate'] = stats.get('stddev')
+        sections.append((department, record))
+    return sections
@@ -0,0 +1,124 @@
+import sys
+from typing import Callable, Dict, Iterable, Optional, Sequence, TextIO, Tuple
+
+BUFFER_SIZE = 1 << 20  # объем накопленного текста, после которого буфер сбрасывается в поток (символов)
+OUTPUT_FORMATS = ('text', 'csv', 'json')
+
+Record = Dict[str, object]
+Section = Tuple[str, Iterable[Record]]
+
+
+def csv_field(value: object) -> str:
+    """значение для CSV: кавычки только там, где они нужны"""
+    text = '' if value is None else str(value)
+    if any(char in text for char in ',"\r\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+class ReportWriter:
+    """буферизованный вывод отчетов: текст копится в памяти и пишется в поток крупными блоками"""
+
+    def __init__(self, stream: Optional[TextIO] = None, output_format: str = 'text',
+                 buffer_size: int = BUFFER_SIZE):
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Неверный формат вывода: '{output_format}'. "
+                             f"Доступные форматы: {', '.join(OUTPUT_FORMATS)}")
+        self.stream = stream  # None — текущий sys.stdout
+        self.output_format = output_format
+        self.buffer_size = buffer_size
+        self._parts = []
+        self._size = 0
+
+    def write(self, text: str) -> None:
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.buffer_size:
+            self.flush()
+
+    def line(self, text: str = '') -> None:
+        self.write(text + '\n')
+
+    def flush(self) -> None:
+        if self._parts:
+            stream = self.stream if self.stream is not None else sys.stdout
+            stream.write(''.join(self._parts))
+            self._parts = []
+            self._size = 0
+
+    def write_report(self, columns: Sequence[str], sections: Iterable[Section],
+                     render_text: Callable[['ReportWriter', str, Iterable[Record]], None]) -> None:
+        """вывод отчета по отделам в выбранном формате"""
+        if self.output_format == 'text':
+            for department, records in sections:
+                render_text(self, department, records)
+        elif self.output_format == 'csv':
+            self.line(','.join(('department',) + tuple(columns)))
+            for department, records in sections:
+                prefix = csv_field(department) + ','
+                for record in records:
+                    self.line(prefix + ','.join(csv_field(record[column]) for column in columns))
+        else:
+            import json  # нужен только для вывода в JSON
+            self.write('[')
+            separator = '\n'
+            for department, records in sections:
+                for record in records:
+                    item = {'department': department}
+                    item.update((column, record[column]) for column in columns)
+                    self.write(separator + json.dumps(item, ensure_ascii=False))
+                    separator = ',\n'
+            self.write('\n]\n')
+        self.flush()
+
+
+def render_payout_text(writer: ReportWriter, department: str, records: Iterable[Record]) -> None:
+    writer.line(f"Department: {department}")
+    writer.line('-' * 150)
+    writer.line(f"{'ID':<5} {'Name':<25} {'Email':<25} {'Hours Worked':<15} {'Hourly Rate':<15} {'Salary':<10}")
+    writer.line('-' * 105)
+    for row in records:
+        writer.write(f"{row['id']:<5} {row['name']:<25} {row['email']:<25} "
+                     f"{row['hours_worked']:<15} {row['hourly_rate']:<15} {row['salary']:<10}\n")
+    writer.line('\n' + '-' * 150 + '\n')
+
+
+def _render_average_rate(writer: ReportWriter, average_rate: Optional[float]) -> None:
+    if average_rate is not None:
+        writer.line(f"Average Hourly Rate: {average_rate:.2f}")
+    else:
+        writer.line("No data available for average hourly rate.")
+
+
+def render_average_rate_text(writer: ReportWriter, department: str, records: Iterable[Record]) -> None:
+    writer.line(f"Department: {department}")
+    writer.line('-' * 150)
+    for record in records:
+        _render_average_rate(writer, record['average_hourly_rate'])
+    writer.line('-' * 150 + '\n')
+
+
+def render_department_summary_text(writer: ReportWriter, department: str, records: Iterable[Record]) -> None:
+    writer.line(f"Department: {department}")
+    writer.line('-' * 150)
+    for record in records:
+        writer.line(f"Employees: {record['employees']}")
+        writer.line(f"Total Hours: {record['total_hours']}")
+        writer.line(f"Total Payout: {record['total_payout']}")
+        _render_average_rate(writer, record['average_hourly_rate'])
+    writer.line('-' * 150 + '\n')
+
+
+def render_rate_statistics_text(writer: ReportWriter, department: str, records: Iterable[Record]) -> None:
+    writer.line(f"Department: {department}")
+    writer.line('-' * 150)
+    for record in records:
+        writer.line(f"Employees: {record['employees']}")
+        if record['mean_hourly_rate'] is None:
+            writer.line("No data available for hourly rate statistics.")
+            continue
+        for column, value in record.items():
+            if column != 'employees':
+                # mean_hourly_rate -> Mean Hourly Rate, p90_hourly_rate -> P90 Hourly Rate
+                writer.line(f"{column[:-len('_hourly_rate')].capitalize()} Hourly Rate: {value:.2f}")
+    writer.line('-' * 150 + '\n')
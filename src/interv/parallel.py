@@ -0,0 +1,147 @@
+import codecs
+import locale
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from .headers import register_header_alias, registered_header_aliases
+from .main import EmployeeData, iter_lines
+from .table import FIELD_ORDER, EmployeeTable
+
+SPLIT_SIZE = 8 << 20  # CSV больше этого размера делится на диапазоны строк (байт)
+
+# файл, диапазон байтов, размер блока, синонимы заголовков, mmap, нужные поля
+Task = Tuple[str, Optional[int], Optional[int], int, Tuple[Tuple[str, str], ...], bool, Tuple[str, ...]]
+
+
+class RangeReader:
+    """чтение текста из байтового диапазона файла (интерфейс read() для iter_lines)"""
+
+    def __init__(self, file: BinaryIO, length: int):
+        self.file = file
+        self.remaining = length
+        # та же кодировка, что у open() в текстовом режиме
+        self.decoder = codecs.getincrementaldecoder(locale.getpreferredencoding(False))()
+
+    def read(self, size: int) -> str:
+        if self.remaining <= 0:
+            return self.decoder.decode(b'', final=True)
+        data = self.file.read(min(size, self.remaining))
+        self.remaining -= len(data)
+        if not data:
+            self.remaining = 0
+        return self.decoder.decode(data, final=self.remaining <= 0)
+
+
+def split_csv_ranges(file_path: str, parts: int, split_size: int = SPLIT_SIZE) -> List[Tuple[int, int]]:
+    """деление строк данных CSV на байтовые диапазоны по границам строк"""
+    size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as file:
+        file.readline()  # заголовки
+        data_start = file.tell()
+        step = max((size - data_start) // max(parts, 1), split_size, 1)
+
+        bounds = [data_start]
+        position = data_start + step
+        while position < size:
+            file.seek(position - 1)
+            file.readline()  # до начала следующей строки
+            position = file.tell()
+            if position >= size:
+                break
+            bounds.append(position)
+            position += step
+        bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def iter_csv_range(reader: EmployeeData, file_path: str, start: int, end: int) -> Iterator[Dict[str, str]]:
+    """стандартизация строк CSV из байтового диапазона [start, end)"""
+    if reader.mmap_csv:
+        from .mmap_csv import iter_mmap_csv
+        yield from iter_mmap_csv(file_path, start, end, fields=reader.fields, block_size=reader.chunk_size)
+        return
+    encoding = locale.getpreferredencoding(False)
+    with open(file_path, 'rb') as file:
+        header_line = file.readline().decode(encoding)
+        if not header_line:
+            return
+        file.seek(start)
+        lines = iter_lines(RangeReader(file, end - start), reader.chunk_size)
+        yield from reader.standardize_lines(chain([header_line], lines))
+
+
+def parse_task(task: Task) -> EmployeeTable:
+    """разбор файла или диапазона CSV в дочернем процессе; результат — компактная колоночная таблица"""
+    file_path, start, end, chunk_size, aliases, mmap_csv, fields = task
+    for standard_field, alias in aliases:  # дочерний процесс может не унаследовать синонимы родителя
+        register_header_alias(standard_field, alias)
+    reader = EmployeeData([file_path], chunk_size=chunk_size, mmap_csv=mmap_csv, columns=fields)
+    if start is None:
+        rows = reader.iter_rows()
+    else:
+        rows = iter_csv_range(reader, file_path, start, end)
+    return EmployeeTable.from_rows(rows)
+
+
+def file_tasks(employee_data: EmployeeData, file_path: str) -> List[Task]:
+    """задания для одного файла: JSON и JSON Lines — целиком, большие CSV — диапазонами строк"""
+    ext = os.path.splitext(file_path)[-1].lower()
+    options = (registered_header_aliases(), employee_data.mmap_csv, employee_data.fields)
+    if ext == '.csv':
+        return [(file_path, start, end, employee_data.chunk_size) + options
+                for start, end in split_csv_ranges(file_path, employee_data.workers)]
+    if ext in ('.json', '.jsonl'):
+        return [(file_path, None, None, employee_data.chunk_size) + options]
+    raise ValueError(f"Неподдерживаемый формат файла: {file_path}")
+
+
+def plan_tasks(employee_data: EmployeeData) -> List[Task]:
+    """задания для пула по всем файлам"""
+    return [task for file in employee_data.files for task in file_tasks(employee_data, file)]
+
+
+def iter_file_tables_parallel(employee_data: EmployeeData) -> Iterator[EmployeeTable]:
+    """таблицы файлов в исходном порядке; файлы, найденные в кэше, не разбираются"""
+    cache = employee_data.cache
+    plan = []  # (файл, ключ кэша, таблица из кэша, количество заданий)
+    tasks = []
+    for file in employee_data.files:
+        key = cache.key(file) if cache is not None else None
+        table = cache.get(file, key) if cache is not None else None
+        if table is None:
+            pending = file_tasks(employee_data, file)
+            tasks.extend(pending)
+            plan.append((file, key, None, len(pending)))
+        else:
+            plan.append((file, key, table, 0))
+
+    with ProcessPoolExecutor(max_workers=employee_data.workers) as executor:
+        results = executor.map(parse_task, tasks)
+        for file, key, table, task_count in plan:
+            if table is None:
+                table = EmployeeTable()
+                for _ in range(task_count):
+                    table.extend(next(results))
+                if cache is not None:
+                    cache.put(file, table, key)
+            yield table
+
+
+def iter_rows_parallel(employee_data: EmployeeData) -> Iterator[Dict[str, str]]:
+    """параллельный разбор файлов; порядок строк и набор полей совпадают с последовательным чтением"""
+    fields = employee_data.fields
+    for table in iter_file_tables_parallel(employee_data):
+        if fields == FIELD_ORDER:
+            yield from table
+        else:
+            yield from ({field: row[field] for field in fields} for row in table)
+
+
+def load_table_parallel(employee_data: EmployeeData) -> EmployeeTable:
+    """параллельный разбор файлов с объединением таблиц в порядке файлов"""
+    result = EmployeeTable()
+    for table in iter_file_tables_parallel(employee_data):
+        result.extend(table)
+    return result
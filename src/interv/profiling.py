@@ -0,0 +1,156 @@
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, TypeVar
+
+T = TypeVar('T')
+
+PROFILE_FORMATS = ('text', 'json')
+
+
+class StageRecord:
+    """показатели одного этапа"""
+    __slots__ = ('name', 'wall', 'cpu', 'rows', 'peak_memory')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.rows: Optional[int] = None
+        self.peak_memory: Optional[int] = None
+
+    @property
+    def rows_per_sec(self) -> Optional[float]:
+        if self.rows is None or self.wall <= 0:
+            return None
+        return self.rows / self.wall
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            'stage': self.name,
+            'wall_seconds': round(self.wall, 6),
+            'cpu_seconds': round(self.cpu, 6),
+            'rows': self.rows,
+            'rows_per_sec': round(self.rows_per_sec, 1) if self.rows_per_sec is not None else None,
+            'peak_memory_bytes': self.peak_memory,
+        }
+
+
+class StageProfiler:
+    """замер этапов запуска: wall и CPU time, строки, строк/с и пиковая память (tracemalloc)
+
+    Время ленивых этапов (timed_iter) вычитается из этапа, внутри которого они потребляются,
+    так что чтение файлов не попадает во время отчета.
+    """
+
+    enabled = True
+
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.stages: List[StageRecord] = []
+        self._records: Dict[str, StageRecord] = {}
+        self._active: List[StageRecord] = []
+        self._started_tracing = False
+
+    def record(self, name: str) -> StageRecord:
+        record = self._records.get(name)
+        if record is None:
+            record = self._records[name] = StageRecord(name)
+            self.stages.append(record)
+        return record
+
+    def start(self) -> None:
+        import tracemalloc  # только при --profile: модуль заметно удлиняет запуск
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        if self._started_tracing:
+            import tracemalloc
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None) -> Iterator[StageRecord]:
+        import tracemalloc
+        record = self.record(name)
+        record.rows = rows
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        self._active.append(record)
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record.wall += time.perf_counter() - start_wall
+            record.cpu += time.process_time() - start_cpu
+            self._active.pop()
+            if self.trace_memory and tracemalloc.is_tracing():
+                record.peak_memory = max(record.peak_memory or 0, tracemalloc.get_traced_memory()[1])
+
+    def timed_iter(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        """ленивый этап: учитывается время внутри next() и количество элементов"""
+        record = self.record(name)
+        record.rows = 0
+        return self._timed(record, iter(iterable))
+
+    def _timed(self, record: StageRecord, iterator: Iterator[T]) -> Iterator[T]:
+        perf_counter, process_time = time.perf_counter, time.process_time
+        while True:
+            start_wall, start_cpu = perf_counter(), process_time()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                wall, cpu = perf_counter() - start_wall, process_time() - start_cpu
+                record.wall += wall
+                record.cpu += cpu
+                for active in self._active:  # исключаем из объемлющих этапов
+                    active.wall -= wall
+                    active.cpu -= cpu
+            record.rows += 1
+            yield item
+
+    def emit(self, output_format: str = 'text', stream: Optional[TextIO] = None) -> None:
+        """сводка по этапам в stderr (или stream)"""
+        stream = stream if stream is not None else sys.stderr
+        if output_format == 'json':
+            import json
+            json.dump({'stages': [record.as_dict() for record in self.stages]}, stream, ensure_ascii=False)
+            stream.write('\n')
+            return
+
+        stream.write(f"{'Stage':<24} {'Wall, s':>9} {'CPU, s':>9} {'Rows':>10} {'Rows/s':>12} {'Peak memory, MB':>16}\n")
+        for record in self.stages:
+            rows = f"{record.rows:>10}" if record.rows is not None else f"{'-':>10}"
+            rate = f"{record.rows_per_sec:>12,.0f}" if record.rows_per_sec is not None else f"{'-':>12}"
+            memory = (f"{record.peak_memory / (1 << 20):>16.1f}" if record.peak_memory is not None
+                      else f"{'-':>16}")
+            stream.write(f"{record.name:<24} {record.wall:>9.3f} {record.cpu:>9.3f} {rows} {rate} {memory}\n")
+
+
+class NullProfiler:
+    """профилирование выключено: этапы выполняются без замеров"""
+
+    enabled = False
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None) -> Iterator[None]:
+        yield None
+
+    def timed_iter(self, name: str, iterable: Iterable[T]) -> Iterable[T]:
+        return iterable
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def emit(self, output_format: str = 'text', stream: Optional[TextIO] = None) -> None:
+        pass
+
+
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,119 @@
+import heapq
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .aggregation import _to_int
+from .table import EmployeeTable
+
+# ключ сотрудника: (зп, -id, -позиция) — при равной зп выше тот, у кого меньше id, затем раньше в данных;
+# без упорядочивания по id вместо id берется позиция строки
+EntryKey = Tuple[int, int, int]
+
+
+class _DepartmentOrder:
+    """порядок отделов как после сортировки по id: по (наименьший id, позиция); с позицией вместо id —
+    порядок первого появления"""
+
+    def __init__(self):
+        self.order: Dict[str, Tuple[int, int]] = {}
+
+    def see(self, department: str, row_id: int, position: int) -> None:
+        current = self.order.get(department)
+        if current is None or row_id < current[0]:
+            self.order[department] = (row_id, position)
+
+    def departments(self) -> List[str]:
+        return sorted(self.order, key=self.order.__getitem__)
+
+
+def _iter_entries(rows: Iterable[Dict[str, str]],
+                  order_by_id: bool = False) -> Iterator[Tuple[str, int, Optional[int], int, object]]:
+    """(отдел, id или позиция, зп или None, позиция, строка или позиция в таблице) без разбора лишних строк
+
+    id разбирается только при order_by_id=True; иначе вместо него отдается позиция строки.
+    """
+    if isinstance(rows, EmployeeTable):
+        ids, hours, rates, departments = rows.ids, rows.hours, rows.rates, rows.departments
+        for i in range(len(rows)):
+            worked, rate = hours.integer(i), rates.integer(i)
+            salary = worked * rate if worked is not None and rate is not None else None
+            yield departments[i], ids.number(i) if order_by_id else i, salary, i, i
+    else:
+        for position, row in enumerate(rows):
+            worked, rate = _to_int(row['hours_worked']), _to_int(row['hourly_rate'])
+            salary = worked * rate if worked is not None and rate is not None else None
+            yield row['department'], int(row['id']) if order_by_id else position, salary, position, row
+
+
+def _materialize(rows: Iterable[Dict[str, str]], item: object, salary: int) -> Dict[str, object]:
+    row = rows.row(item) if isinstance(rows, EmployeeTable) else item
+    return dict(row, salary=salary)
+
+
+def top_earners(rows: Iterable[Dict[str, str]], limit: int,
+                order_by_id: bool = False) -> List[Tuple[str, List[Dict[str, object]]]]:
+    """limit сотрудников с наибольшей зп в каждом отделе
+
+    Один проход с ограниченной кучей на отдел: O(n log limit) времени и O(отделов × limit) памяти,
+    без сортировки всех сотрудников. Строки без вычислимой зп и отделы без них пропускаются.
+    Отделы — в порядке первого появления, при order_by_id=True — как после сортировки по id.
+    """
+    order = _DepartmentOrder()
+    heaps: Dict[str, List[Tuple[EntryKey, object]]] = {}
+    for department, row_id, salary, position, item in _iter_entries(rows, order_by_id):
+        order.see(department, row_id, position)
+        heap = heaps.setdefault(department, [])
+        if salary is None:
+            continue
+        entry = ((salary, -row_id, -position), item)
+        if len(heap) < limit:
+            heapq.heappush(heap, entry)
+        elif entry[0] > heap[0][0]:
+            heapq.heapreplace(heap, entry)
+
+    result = []
+    for department in order.departments():
+        if not heaps[department]:
+            continue
+        entries = sorted(heaps[department], key=lambda entry: entry[0], reverse=True)
+        result.append((department, [_materialize(rows, item, key[0]) for key, item in entries]))
+    return result
+
+
+class SalaryIndex:
+    """отсортированные по зп сотрудники каждого отдела для запросов по диапазону через bisect
+
+    Строится один раз за O(n log n); запрос диапазона — O(log n + k) на отдел.
+    """
+
+    def __init__(self, rows: Iterable[Dict[str, str]], order_by_id: bool = False):
+        self.rows = rows
+        order = _DepartmentOrder()
+        entries: Dict[str, List[Tuple[int, int, int, object]]] = {}
+        for department, row_id, salary, position, item in _iter_entries(rows, order_by_id):
+            order.see(department, row_id, position)
+            department_entries = entries.setdefault(department, [])
+            if salary is not None:
+                department_entries.append((salary, row_id, position, item))
+
+        self.departments = order.departments()
+        self.salaries: Dict[str, List[int]] = {}
+        self.items: Dict[str, List[object]] = {}
+        for department, department_entries in entries.items():
+            department_entries.sort(key=lambda entry: entry[:3])
+            self.salaries[department] = [entry[0] for entry in department_entries]
+            self.items[department] = [entry[3] for entry in department_entries]
+
+    def salary_range(self, min_salary: Optional[float] = None,
+                     max_salary: Optional[float] = None) -> List[Tuple[str, List[Dict[str, object]]]]:
+        """сотрудники с зп в границах [min_salary, max_salary] по отделам, по возрастанию зп; пустые отделы опускаются"""
+        result = []
+        for department in self.departments:
+            salaries = self.salaries[department]
+            start = bisect_left(salaries, min_salary) if min_salary is not None else 0
+            end = bisect_right(salaries, max_salary) if max_salary is not None else len(salaries)
+            if start >= end:
+                continue
+            items = self.items[department]
+            result.append((department, [_materialize(self.rows, items[i], salaries[i]) for i in range(start, end)]))
+        return result
@@ -0,0 +1,295 @@
+import argparse
+import errno
+import io
+import json
+import os
+import socket
+import sys
+from stat import S_ISSOCK
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .headers import register_header_alias
+from .main import CONFLICT_POLICIES, EmployeeData, ReportGenerator, parse_percentiles, sorting_data, warn_duplicates
+from .output import OUTPUT_FORMATS, ReportWriter
+from .table import EmployeeTable
+
+POLL_INTERVAL = 2.0  # как часто проверять изменения входных файлов (секунд)
+MEMO_SIZE = 256  # сколько готовых отчетов держать в памяти
+CONTENT_TYPES = {'text': 'text/plain; charset=utf-8', 'csv': 'text/csv; charset=utf-8',
+                 'json': 'application/json; charset=utf-8'}
+
+Signature = Tuple[Tuple[str, int, int], ...]
+
+
+class ReportService:
+    """данные в памяти и готовые отчеты до изменения входных файлов
+
+    Файлы загружаются один раз в отсортированную по id колоночную таблицу. Фоновый поток
+    (watch) раз в poll_interval сравнивает размер и mtime файлов и при изменении перечитывает
+    их; отчеты запоминаются по типу, формату и параметрам и сбрасываются вместе с данными.
+    """
+
+    def __init__(self, employee_data: EmployeeData, poll_interval: float = POLL_INTERVAL):
+        self.employee_data = employee_data
+        self.poll_interval = poll_interval
+        self.table: Optional[EmployeeTable] = None
+        self.signature: Signature = ()
+        self.loaded_at = 0.0
+        self.reloads = 0
+        self.last_error: Optional[str] = None
+        self._memo: Dict[Tuple, str] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def file_signature(self) -> Signature:
+        signature = []
+        for file_path in self.employee_data.files:
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                signature.append((file_path, -1, -1))
+            else:
+                signature.append((file_path, stat.st_size, stat.st_mtime_ns))
+        return tuple(signature)
+
+    def load(self) -> None:
+        """чтение всех файлов; ошибки передаются вызывающему"""
+        signature = self.file_signature()
+        self.employee_data.validate_files()
+        duplicates = []
+        table = sorting_data(self.employee_data.load_table(), duplicates)
+        warn_duplicates(duplicates)
+        with self._lock:
+            self.table = table
+            self.signature = signature
+            self.loaded_at = time.time()
+            self.reloads += 1
+            self.last_error = None
+            self._memo.clear()
+
+    def refresh(self) -> bool:
+        """перечитывание данных, если файлы изменились; при ошибке остаются прежние данные"""
+        if self.file_signature() == self.signature:
+            return False
+        try:
+            self.load()
+        except Exception as e:
+            with self._lock:
+                self.last_error = str(e)
+            print(f"Не удалось перечитать данные: {e}", file=sys.stderr)
+            return False
+        return True
+
+    def watch(self) -> threading.Thread:
+        """запуск фонового потока, следящего за входными файлами"""
+        def loop():
+            while not self._stopped.wait(self.poll_interval):
+                self.refresh()
+
+        thread = threading.Thread(target=loop, name='interv-watch', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def report(self, report_type: str, output_format: str = 'text', options: Optional[Dict] = None) -> str:
+        """текст отчета; повторный запрос с теми же параметрами отвечает из памяти"""
+        options = options or {}
+        key = (report_type, output_format, tuple(sorted(options.items())))
+        with self._lock:
+            table, memo = self.table, self._memo
+            cached = memo.get(key)
+        if cached is not None:
+            return cached
+        if table is None:
+            raise ValueError("Данные еще не загружены")
+
+        stream = io.StringIO()
+        writer = ReportWriter(stream, output_format=output_format)
+        ReportGenerator(table, presorted=True, writer=writer, options=options).run_report(report_type)
+        text = stream.getvalue()
+        with self._lock:
+            if memo is self._memo and self.table is table:  # данные не сменились, пока строился отчет
+                if len(memo) >= MEMO_SIZE:
+                    memo.clear()
+                memo[key] = text
+        return text
+
+    def status(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                'files': list(self.employee_data.files),
+                'rows': len(self.table) if self.table is not None else 0,
+                'loaded_at': self.loaded_at,
+                'reloads': self.reloads,
+                'memoized_reports': len(self._memo),
+                'last_error': self.last_error,
+            }
+
+
+def report_options(query: Dict[str, List[str]]) -> Dict[str, object]:
+    """параметры отчета из строки запроса: limit, min, max, percentiles, backend"""
+    def value(name: str) -> Optional[str]:
+        values = query.get(name)
+        return values[-1] if values else None
+
+    options = {}
+    try:
+        if value('limit') is not None:
+            options['limit'] = int(value('limit'))
+        if value('min') is not None:
+            options['min_salary'] = float(value('min'))
+        if value('max') is not None:
+            options['max_salary'] = float(value('max'))
+    except ValueError:
+        raise ValueError("Параметры limit, min и max должны быть числами") from None
+    if value('percentiles') is not None:
+        options['percentiles'] = parse_percentiles(value('percentiles'))
+    if value('backend') is not None:
+        options['numeric_backend'] = value('backend')
+    return options
+
+
+class ReportRequestHandler(BaseHTTPRequestHandler):
+    """GET /reports/<тип>?format=json&limit=5 и GET /status"""
+    service: ReportService  # задается в make_server
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path == '/status':
+            self.respond(200, json.dumps(self.service.status(), ensure_ascii=False) + '\n', 'json')
+            return
+        if not url.path.startswith('/reports/'):
+            self.respond(404, "Неизвестный адрес: используйте /reports/<тип отчета> или /status\n")
+            return
+
+        report_type = url.path[len('/reports/'):]
+        if report_type not in ReportGenerator.REPORT_COLUMNS:
+            self.respond(404, f"Неверный тип отчета: '{report_type}'. "
+                              f"Доступные отчеты: {', '.join(ReportGenerator.REPORT_COLUMNS)}\n")
+            return
+        query = parse_qs(url.query)
+        output_format = query.get('format', ['text'])[-1]
+        if output_format not in OUTPUT_FORMATS:
+            self.respond(400, f"Неверный формат вывода: '{output_format}'\n")
+            return
+        try:
+            body = self.service.report(report_type, output_format, report_options(query))
+        except ValueError as e:
+            self.respond(400, f"{e}\n")
+            return
+        self.respond(200, body, output_format)
+
+    def respond(self, status: int, body: str, output_format: str = 'text') -> None:
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', CONTENT_TYPES[output_format])
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args) -> None:
+        pass  # журнал запросов не нужен: отчеты запрашиваются много раз в минуту
+
+
+class UnixHTTPServer(ThreadingHTTPServer):
+    address_family = socket.AF_UNIX
+    bound = False  # сокет создан этим сервером и удаляется при закрытии
+
+    def server_bind(self) -> None:
+        try:
+            mode = os.lstat(self.server_address).st_mode
+        except FileNotFoundError:
+            pass
+        else:
+            if not S_ISSOCK(mode):
+                raise FileExistsError(f"Путь {self.server_address} занят и не является сокетом")
+            with socket.socket(socket.AF_UNIX) as probe:
+                try:
+                    probe.connect(self.server_address)
+                except ConnectionRefusedError:
+                    os.remove(self.server_address)  # сокет от предыдущего запуска: его никто не слушает
+                else:
+                    raise OSError(errno.EADDRINUSE, f"Сокет {self.server_address} уже слушает другой сервер")
+        self.socket.bind(self.server_address)
+        self.bound = True
+        self.server_name, self.server_port = 'localhost', 0
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ('local', 0)  # у клиента Unix-сокета нет адреса
+
+    def server_close(self) -> None:
+        super().server_close()
+        if self.bound:
+            try:
+                os.remove(self.server_address)
+            except OSError:
+                pass
+
+
+def make_server(service: ReportService, host: str = '127.0.0.1', port: int = 8765,
+                socket_path: Optional[str] = None) -> ThreadingHTTPServer:
+    handler = type('BoundReportRequestHandler', (ReportRequestHandler,), {'service': service})
+    if socket_path:
+        return UnixHTTPServer(socket_path, handler)
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Сервер отчетов: данные загружаются один раз и держатся в памяти")
+    parser.add_argument('files', metavar='F', type=str, nargs='+', help="Список файлов")
+    parser.add_argument('--host', type=str, default='127.0.0.1', help="Адрес HTTP (по умолчанию 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765, help="Порт HTTP (по умолчанию 8765)")
+    parser.add_argument('--socket', type=str, default=None, metavar='PATH',
+                        help="Unix-сокет вместо TCP-порта")
+    parser.add_argument('--poll-interval', type=float, default=POLL_INTERVAL,
+                        help="Период проверки изменений входных файлов, секунд")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Количество процессов для параллельного разбора файлов")
+    parser.add_argument('--mmap', action='store_true', help="Чтение CSV через mmap")
+    parser.add_argument('--header-alias', action='append', default=[], metavar='FIELD=ALIAS',
+                        help="Дополнительный синоним заголовка (можно повторять)")
+    parser.add_argument('--dedupe-by', type=str, default=None, metavar='FIELDS',
+                        help="Слияние повторов сотрудника по полям: id, email или id,email")
+    parser.add_argument('--on-conflict', type=str, default='first', choices=CONFLICT_POLICIES,
+                        help="Какую строку оставлять при слиянии: first, last или sum_hours")
+    args = parser.parse_args(argv)
+
+    try:
+        for header_alias in args.header_alias:
+            standard_field, separator, alias = header_alias.partition('=')
+            if not separator:
+                raise ValueError(f"Синоним заголовка задается как ПОЛЕ=СИНОНИМ, получено: '{header_alias}'")
+            register_header_alias(standard_field.strip(), alias)
+        dedupe_fields = tuple(field.strip() for field in args.dedupe_by.split(',') if field.strip()) \
+            if args.dedupe_by else ()
+        service = ReportService(EmployeeData(args.files, workers=args.workers, mmap_csv=args.mmap,
+                                             dedupe_by=dedupe_fields, on_conflict=args.on_conflict),
+                                poll_interval=args.poll_interval)
+        service.load()
+        server = make_server(service, args.host, args.port, args.socket)
+    except Exception as e:
+        print(f"\n Произошла ошибка: {str(e)}", file=sys.stderr)
+        return 1
+
+    service.watch()
+    address = args.socket or f"http://{args.host}:{server.server_port}"
+    print(f"Сервер отчетов: {address} ({len(service.table)} строк)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,320 @@
+import marshal
+import sys
+from array import array
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+FIELD_ORDER = ('id', 'email', 'name', 'department', 'hours_worked', 'hourly_rate')
+TABLE_FORMAT_VERSION = 1  # версия двоичного формата dump_table/load_table
+DENSE_ID_FACTOR = 2  # id считаются плотными, если диапазон не больше DENSE_ID_FACTOR × число строк
+
+
+def id_order(keys: List[int]) -> Tuple[List[int], List[int]]:
+    """устойчивый порядок позиций по возрастанию id и список повторяющихся id
+
+    Плотные уникальные id раскладываются по корзинам за O(n + диапазон) без сравнений;
+    при разреженных id или повторах — сортировка по заранее вычисленным ключам.
+    """
+    size = len(keys)
+    if not size:
+        return [], []
+
+    low, high = min(keys), max(keys)
+    if high - low < DENSE_ID_FACTOR * size + 16:
+        # корзина на каждое значение id; раскладка — в цикле на C (map), без вызова функций на строку
+        if low >= 0 and high < DENSE_ID_FACTOR * size + 16:
+            slots = [None] * (high + 1)
+            indices = keys
+        else:
+            slots = [None] * (high - low + 1)
+            indices = map(low.__rsub__, keys)
+        deque(map(slots.__setitem__, indices, range(size)), maxlen=0)
+        empty = slots.count(None)
+        if len(slots) - empty == size:  # все id различны
+            return (slots if not empty else [position for position in slots if position is not None]), []
+
+    order = sorted(range(size), key=keys.__getitem__)
+    duplicates = []
+    previous = None
+    for position in order:
+        key = keys[position]
+        if key == previous and (not duplicates or duplicates[-1] != key):
+            duplicates.append(key)
+        previous = key
+    return order, duplicates
+
+
+class NumericColumn:
+    """целочисленная колонка: канонические целые хранятся в array('q'), остальные значения — исходной строкой"""
+    __slots__ = ('values', 'raw')
+
+    def __init__(self):
+        self.values = array('q')
+        self.raw: Dict[int, str] = {}  # позиция -> исходная строка ('', 'n/a', '050', '12.5' ...)
+
+    def append(self, text: str) -> None:
+        try:
+            number = int(text)
+        except (ValueError, TypeError):
+            number = None
+        # храним числом только то, что без потерь превращается обратно в ту же строку
+        if number is not None and -(1 << 63) <= number < (1 << 63) and str(number) == text:
+            self.values.append(number)
+        else:
+            self.raw[len(self.values)] = text
+            self.values.append(0)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def text(self, i: int) -> str:
+        if self.raw and i in self.raw:
+            return self.raw[i]
+        return str(self.values[i])
+
+    def number(self, i: int) -> int:
+        """целое значение; для нечисловых значений — ValueError, как у int()"""
+        if self.raw and i in self.raw:
+            return int(self.raw[i])
+        return self.values[i]
+
+    def integer(self, i: int) -> Optional[int]:
+        """целое значение или None, если строка не целое число"""
+        try:
+            return self.number(i)
+        except (ValueError, TypeError):
+            return None
+
+    def real(self, i: int) -> Optional[float]:
+        """значение как float или None, если строка не число"""
+        if self.raw and i in self.raw:
+            try:
+                return float(self.raw[i])
+            except ValueError:
+                return None
+        return float(self.values[i])
+
+    def take(self, indices: Sequence[int]) -> 'NumericColumn':
+        column = NumericColumn()
+        values = self.values
+        column.values = array('q', [values[i] for i in indices])
+        if self.raw:
+            column.raw = {j: self.raw[i] for j, i in enumerate(indices) if i in self.raw}
+        return column
+
+    def extend(self, other: 'NumericColumn') -> None:
+        offset = len(self.values)
+        self.values.extend(other.values)
+        for i, text in other.raw.items():
+            self.raw[offset + i] = text
+
+
+class StringColumn:
+    """строковая колонка: значения лежат подряд в одном буфере UTF-8, границы — в array смещений"""
+    __slots__ = ('buffer', 'offsets')
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.offsets = array('Q', [0])
+
+    def append(self, text: str) -> None:
+        self.buffer += text.encode('utf-8', 'surrogatepass')
+        self.offsets.append(len(self.buffer))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self.buffer[self.offsets[i]:self.offsets[i + 1]].decode('utf-8', 'surrogatepass')
+
+    def take(self, indices: Sequence[int]) -> 'StringColumn':
+        column = StringColumn()
+        buffer, offsets = self.buffer, self.offsets
+        for i in indices:
+            column.buffer += buffer[offsets[i]:offsets[i + 1]]
+            column.offsets.append(len(column.buffer))
+        return column
+
+    def extend(self, other: 'StringColumn') -> None:
+        base = len(self.buffer)
+        self.buffer += other.buffer
+        self.offsets.extend(base + offset for offset in other.offsets[1:])
+
+
+class CategoryColumn:
+    """колонка с малым числом различных значений (отделы): коды в array('I'), значения интернированы"""
+    __slots__ = ('codes', 'categories', '_index')
+
+    def __init__(self):
+        self.codes = array('I')
+        self.categories: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def code(self, text: str) -> int:
+        code = self._index.get(text)
+        if code is None:
+            code = self._index[text] = len(self.categories)
+            self.categories.append(sys.intern(text))
+        return code
+
+    def append(self, text: str) -> None:
+        self.codes.append(self.code(text))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, i: int) -> str:
+        return self.categories[self.codes[i]]
+
+    def take(self, indices: Sequence[int]) -> 'CategoryColumn':
+        column = CategoryColumn()
+        column.categories = list(self.categories)
+        column._index = dict(self._index)
+        codes = self.codes
+        column.codes = array('I', [codes[i] for i in indices])
+        return column
+
+    def extend(self, other: 'CategoryColumn') -> None:
+        remap = [self.code(category) for category in other.categories]
+        self.codes.extend(remap[code] for code in other.codes)
+
+
+class EmployeeTable:
+    """колоночное хранилище сотрудников: id, часы и ставка — типизированные массивы, строки упакованы"""
+
+    def __init__(self):
+        self.ids = NumericColumn()
+        self.emails = StringColumn()
+        self.names = StringColumn()
+        self.departments = CategoryColumn()
+        self.hours = NumericColumn()
+        self.rates = NumericColumn()
+
+    def _columns(self) -> Tuple:
+        return self.ids, self.emails, self.names, self.departments, self.hours, self.rates
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, str]]) -> 'EmployeeTable':
+        table = cls()
+        for row in rows:
+            table.append(row)
+        return table
+
+    def append(self, row: Dict[str, str]) -> None:
+        for column, key in zip(self._columns(), FIELD_ORDER):
+            column.append(row.get(key, ''))
+
+    def extend(self, other: 'EmployeeTable') -> None:
+        for column, other_column in zip(self._columns(), other._columns()):
+            column.extend(other_column)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def row(self, i: int) -> Dict[str, str]:
+        """строка в привычном виде словаря"""
+        return {
+            'id': self.ids.text(i),
+            'email': self.emails[i],
+            'name': self.names[i],
+            'department': self.departments[i],
+            'hours_worked': self.hours.text(i),
+            'hourly_rate': self.rates.text(i),
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def take(self, indices: Sequence[int]) -> 'EmployeeTable':
+        table = EmployeeTable.__new__(EmployeeTable)
+        (table.ids, table.emails, table.names,
+         table.departments, table.hours, table.rates) = (column.take(indices) for column in self._columns())
+        return table
+
+    def id_keys(self) -> List[int]:
+        """id как целые числа; нечисловой id — ValueError, как в sorting_data"""
+        if not self.ids.raw:
+            return self.ids.values.tolist()
+        return [self.ids.number(i) for i in range(len(self))]
+
+    def sorted_by_id(self, duplicates: Optional[List[int]] = None) -> 'EmployeeTable':
+        """таблица, упорядоченная по id; повторяющиеся id добавляются в duplicates"""
+        order, repeated = id_order(self.id_keys())
+        if duplicates is not None:
+            duplicates.extend(repeated)
+        return self.take(order)
+
+    def group_by(self, key: str) -> Dict[str, 'EmployeeTable']:
+        """группировка по полю; для отделов — по кодам без декодирования строк"""
+        groups: Dict[object, List[int]] = {}
+        if key == 'department':
+            for i, code in enumerate(self.departments.codes):
+                groups.setdefault(code, []).append(i)
+            categories = self.departments.categories
+            return {categories[code]: self.take(indices) for code, indices in groups.items()}
+
+        for i in range(len(self)):
+            groups.setdefault(self.row(i)[key], []).append(i)
+        return {value: self.take(indices) for value, indices in groups.items()}
+
+    def salary(self, i: int) -> int:
+        """зарплата (часы × ставка) без повторного разбора строк"""
+        return self.hours.number(i) * self.rates.number(i)
+
+
+def _dump_numeric(column: NumericColumn) -> Tuple:
+    return column.values.tobytes(), column.raw
+
+
+def _load_numeric(state: Tuple) -> NumericColumn:
+    column = NumericColumn()
+    column.values.frombytes(state[0])
+    column.raw = state[1]
+    return column
+
+
+def _dump_strings(column: StringColumn) -> Tuple:
+    return bytes(column.buffer), column.offsets.tobytes()
+
+
+def _load_strings(state: Tuple) -> StringColumn:
+    column = StringColumn()
+    column.buffer = bytearray(state[0])
+    column.offsets = array('Q')
+    column.offsets.frombytes(state[1])
+    return column
+
+
+def dump_table(table: EmployeeTable) -> bytes:
+    """компактное двоичное представление таблицы (marshal поверх сырых байтов колонок)"""
+    departments = table.departments
+    return marshal.dumps((
+        TABLE_FORMAT_VERSION,
+        sys.byteorder,
+        _dump_numeric(table.ids),
+        _dump_strings(table.emails),
+        _dump_strings(table.names),
+        (departments.codes.tobytes(), departments.categories),
+        _dump_numeric(table.hours),
+        _dump_numeric(table.rates),
+    ))
+
+
+def load_table(data: bytes) -> EmployeeTable:
+    """восстановление таблицы из dump_table; при несовместимом формате — ValueError"""
+    state = marshal.loads(data)
+    if not isinstance(state, tuple) or state[:2] != (TABLE_FORMAT_VERSION, sys.byteorder):
+        raise ValueError("Несовместимый формат сохраненной таблицы.")
+
+    table = EmployeeTable()
+    table.ids = _load_numeric(state[2])
+    table.emails = _load_strings(state[3])
+    table.names = _load_strings(state[4])
+    codes, categories = state[5]
+    table.departments.codes.frombytes(codes)
+    for category in categories:
+        table.departments.code(category)
+    table.hours = _load_numeric(state[6])
+    table.rates = _load_numeric(state[7])
+    return table
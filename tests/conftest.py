@@ -0,0 +1,97 @@
+"""общие тестовые данные: синтетические сотрудники и наборы входных файлов"""
+import json
+import random
+
+import pytest
+
+CSV_HEADERS = ('email', 'name', 'department', 'hours_worked', 'salary', 'id')  # заголовки CSV по умолчанию
+# стандартное поле для заголовков-синонимов, которые пишут тесты
+HEADER_FIELDS = {'salary': 'hourly_rate', 'rate': 'hourly_rate', 'hours': 'hours_worked',
+                 'emp_id': 'id', 'full_name': 'name', 'dept': 'department'}
+
+
+def employee(i):
+    """синтетический сотрудник с номером i"""
+    return {'id': str(i), 'email': f'user{i}@example.com', 'name': f'User {i}', 'department': f'Dept{i % 3}',
+            'hours_worked': str(150 + i), 'hourly_rate': str(40 + i % 7)}
+
+
+@pytest.fixture
+def write_csv():
+    """запись CSV из count синтетических сотрудников с номерами от start; возвращает путь строкой"""
+    def write(path, count, headers=CSV_HEADERS, start=0):
+        lines = [','.join(headers)]
+        for i in range(start, start + count):
+            row = employee(i)
+            lines.append(','.join(row[HEADER_FIELDS.get(header, header)] for header in headers))
+        path.write_text('\n'.join(lines) + '\n')
+        return str(path)
+    return write
+
+
+@pytest.fixture
+def write_json():
+    """запись списка записей JSON-массивом, а при расширении .jsonl — по записи в строке"""
+    def write(path, records):
+        if path.suffix == '.jsonl':
+            path.write_text(''.join(json.dumps(record) + '\n' for record in records))
+        else:
+            path.write_text(json.dumps(records))
+        return str(path)
+    return write
+
+
+@pytest.fixture
+def make_rows():
+    """count стандартизированных строк со случайными несортированными id, отделами, часами и ставками"""
+    def make(count, seed=7, fractional_rates=False):
+        generator = random.Random(seed)
+        rows = []
+        for i in generator.sample(range(1, count * 3), count):
+            rate = str(generator.randint(40, 45))
+            if fractional_rates and generator.random() < 0.5:
+                rate = f"{generator.uniform(10, 90):.2f}"
+            rows.append({'id': str(i), 'email': f'user{i}@example.com', 'name': f'User {i}',
+                         'department': generator.choice(['HR', 'IT', 'Sales']),
+                         'hours_worked': str(generator.randint(100, 110)), 'hourly_rate': rate})
+        return rows
+    return make
+
+
+@pytest.fixture
+def mixed_files(tmp_path, write_csv, write_json):
+    """count CSV по одному сотруднику, затем JSON и JSONL; возвращает пути в порядке чтения"""
+    def write(count=5):
+        files = [write_csv(tmp_path / f"data{i}.csv", 1, start=i) for i in range(count)]
+        files.append(write_json(tmp_path / "workers.json",
+                                [{"id": "90", "name": "Zed", "department": "HR", "hours": "1", "rate": "2"}]))
+        files.append(write_json(tmp_path / "workers.jsonl",
+                                [{"id": "91", "name": "Amy", "department": "HR", "hours": "3", "rate": "4"}]))
+        return files
+    return write
+
+
+@pytest.fixture
+def department_files(tmp_path):
+    """CSV и JSON с несортированными id и строками без вычислимой зп"""
+    first = tmp_path / "a.csv"
+    first.write_text("id,name,department,hours,rate\n30,Carol,HR,100,40\n2,Bob,IT,150,60.5\n")
+    second = tmp_path / "b.json"
+    second.write_text('[{"id": "1", "name": "Dan", "department": "Ops", "hours": "", "rate": "n/a"},'
+                      ' {"id": "10", "name": "Alice", "department": "HR", "hours": "160", "rate": "50"}]')
+    return [str(first), str(second)]
+
+
+@pytest.fixture
+def duplicate_files(tmp_path):
+    """CSV и JSON, в которых одни и те же сотрудники повторяются с другим id или email"""
+    file1 = tmp_path / "data1.csv"
+    file1.write_text("id,email,name,department,hours_worked,hourly_rate\n"
+                     "1,alice@example.com,Alice Johnson,Marketing,160,50\n"
+                     "2,bob@example.com,Bob Smith,Design,150,40\n")
+    file2 = tmp_path / "workers.json"
+    file2.write_text('[{"id": "525", "email": "Alice@Example.com", "name": "Alice J.", "department": "Sales",'
+                     ' "hours_worked": "10", "hourly_rate": "55"},'
+                     ' {"id": "2", "email": "", "name": "Bob S.", "department": "Design",'
+                     ' "hours_worked": "5", "hourly_rate": "40"}]')
+    return [str(file1), str(file2)]
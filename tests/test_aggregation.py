@@ -0,0 +1,65 @@
+from src.interv.aggregation import DepartmentAggregator
+from src.interv.main import ReportGenerator, sorting_data
+
+
+ROWS = [
+    {'id': '30', 'email': '', 'name': 'Carol', 'department': 'HR', 'hours_worked': '100', 'hourly_rate': '40'},
+    {'id': '2', 'email': '', 'name': 'Bob', 'department': 'IT', 'hours_worked': '150', 'hourly_rate': '60'},
+    {'id': '10', 'email': '', 'name': 'Alice', 'department': 'HR', 'hours_worked': '160', 'hourly_rate': '50'},
+    {'id': '1', 'email': '', 'name': 'Dan', 'department': 'Ops', 'hours_worked': '', 'hourly_rate': 'n/a'},
+]
+
+
+def test_aggregator_totals():
+    aggregator = DepartmentAggregator().consume(ROWS)
+    hr = aggregator.departments['HR']
+
+    assert aggregator.rows == 4
+    assert hr.employees == 2
+    assert hr.hours_total == 260
+    assert hr.payout_total == 100 * 40 + 160 * 50
+    assert hr.average_rate == 45
+    assert aggregator.departments['Ops'].average_rate is None
+
+
+def test_aggregator_order_matches_sorted_data():
+    """Тест: порядок отделов без сортировки совпадает с порядком после sorting_data"""
+    by_id = [department for department, _ in DepartmentAggregator(order_by_id=True).consume(ROWS).items()]
+    first_seen = [department for department, _ in DepartmentAggregator().consume(ROWS).items()]
+    grouped = ReportGenerator([]).employee_data.group_by(sorting_data(ROWS), 'department')
+
+    assert by_id == list(grouped.keys()) == ['Ops', 'IT', 'HR']
+    assert first_seen == ['HR', 'IT', 'Ops']
+
+
+def test_streaming_report_matches_sorted_report(capfd):
+    ReportGenerator(iter(ROWS), order_by_id=True).run_report('average_hourly_rate')
+    streamed, _ = capfd.readouterr()
+    ReportGenerator(sorting_data(ROWS), presorted=True).run_report('average_hourly_rate')
+    presorted, _ = capfd.readouterr()
+
+    assert streamed == presorted
+    assert "Average Hourly Rate: 45.00" in streamed
+
+
+def test_default_report_order_is_first_appearance(capfd):
+    rows = [dict(row, id=f"emp-{row['id']}", hours_worked=row['hours_worked'] or '10', hourly_rate='40')
+            for row in ROWS]  # id не разбираются, если порядок по id не нужен
+
+    ReportGenerator(iter(rows)).run_report('average_hourly_rate')
+    summary, _ = capfd.readouterr()
+    ReportGenerator(rows, presorted=True).run_report('payout')
+    payout, _ = capfd.readouterr()
+
+    departments = ['HR', 'IT', 'Ops']
+    assert [line.split(': ')[1] for line in summary.splitlines() if line.startswith('Department:')] == departments
+    assert [line.split(': ')[1] for line in payout.splitlines() if line.startswith('Department:')] == departments
+
+
+def test_department_summary_report(capfd):
+    ReportGenerator(ROWS).run_report('department_summary')
+    out, _ = capfd.readouterr()
+
+    assert "Department: HR" in out
+    assert "Employees: 2" in out
+    assert "Total Payout: 12000" in out
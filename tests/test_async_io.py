@@ -0,0 +1,99 @@
+import time
+
+import pytest
+
+from src.interv.async_io import READ_AHEAD, iter_loaded_files, missing_files
+from src.interv.cache import ParsedFileCache
+from src.interv.main import EmployeeData
+
+
+@pytest.mark.parametrize('concurrency', [1, 2, 16])
+def test_async_rows_match_sync(mixed_files, concurrency):
+    files = mixed_files()
+
+    expected = EmployeeData(files).process_multiple_files()
+
+    assert EmployeeData(files, io_concurrency=concurrency).process_multiple_files() == expected
+    assert list(EmployeeData(files, io_concurrency=concurrency).load_table()) == expected
+
+
+def test_async_reads_through_cache(tmp_path, mixed_files):
+    files = mixed_files()
+    cache = ParsedFileCache(str(tmp_path / "cache"))
+    expected = EmployeeData(files).process_multiple_files()
+
+    first = EmployeeData(files, cache=cache, io_concurrency=3).process_multiple_files()
+    loaded = [type(item).__name__ for _, _, item in iter_loaded_files(EmployeeData(files, cache=cache, io_concurrency=3))]
+
+    assert first == expected
+    assert set(loaded) == {'EmployeeTable'}
+    assert EmployeeData(files, cache=cache, io_concurrency=3).process_multiple_files() == expected
+
+
+def test_async_validate_files(tmp_path, mixed_files):
+    files = mixed_files(2)
+    missing = str(tmp_path / "missing.csv")
+
+    assert missing_files(files + [missing], concurrency=2) == [missing]
+    with pytest.raises(FileNotFoundError):
+        EmployeeData(files + [missing], io_concurrency=2).validate_files()
+
+
+def test_async_reader_can_stop_early(mixed_files):
+    files = mixed_files()
+    rows = EmployeeData(files, io_concurrency=2).iter_rows()
+
+    assert next(rows)['id'] == '0'
+    rows.close()
+
+
+def test_async_reads_ahead_of_parsing(tmp_path, mixed_files, write_csv):
+    files = mixed_files(3)
+    write_csv(tmp_path / "data0.csv", 300)
+    employee_data = EmployeeData(files, chunk_size=64, io_concurrency=2)
+
+    loaded_files = iter_loaded_files(employee_data)
+    _, _, loaded = next(loaded_files)
+    # поток читает большой файл, пока разбор не начался, но не дальше READ_AHEAD блоков
+    with loaded.condition:
+        assert loaded.condition.wait_for(lambda: len(loaded.chunks) == READ_AHEAD, timeout=5)
+    time.sleep(0.05)
+    assert len(loaded.chunks) == READ_AHEAD and not loaded.done
+    assert all(len(chunk) <= 64 for chunk in loaded.chunks)
+
+    text = ''.join(iter(lambda: loaded.read(64), ''))
+    with open(files[0]) as file:
+        assert text == file.read()
+    loaded_files.close()
+
+    assert EmployeeData(files, chunk_size=64, io_concurrency=2).process_multiple_files() == \
+        EmployeeData(files, chunk_size=64).process_multiple_files()
+
+
+def test_async_reader_stops_threads_on_early_stop(tmp_path, mixed_files, write_csv):
+    files = mixed_files()
+    write_csv(tmp_path / "data1.csv", 300)
+    loaded_files = iter_loaded_files(EmployeeData(files, chunk_size=64, io_concurrency=3))
+
+    _, _, loaded = next(loaded_files)
+    loaded_files.close()
+
+    assert loaded.closed and loaded.done
+
+
+def test_async_read_error_is_raised_in_order(tmp_path, mixed_files):
+    files = mixed_files(2)
+    missing = str(tmp_path / "missing.csv")
+    rows = EmployeeData(files + [missing], io_concurrency=2).iter_rows()
+
+    assert [next(rows)['id'] for _ in files] == ['0', '1', '90', '91']
+    with pytest.raises(FileNotFoundError):
+        next(rows)
+
+
+def test_async_uses_mmap_reader(mixed_files):
+    files = mixed_files()
+
+    expected = EmployeeData(files, mmap_csv=True).process_multiple_files()
+
+    assert EmployeeData(files, mmap_csv=True, io_concurrency=2).process_multiple_files() == expected
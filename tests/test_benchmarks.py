@@ -0,0 +1,34 @@
+import json
+
+from benchmarks.suite import compare, main as run_benchmarks
+from benchmarks.synthetic import generate_exports
+from src.interv.main import EmployeeData
+
+
+def test_generate_exports_dialects(tmp_path):
+    files = generate_exports(str(tmp_path), rows=30, files=4)
+
+    rows = EmployeeData(files).process_multiple_files()
+    assert [file.rsplit('.', 1)[-1] for file in files] == ['csv', 'csv', 'csv', 'json']
+    assert sorted(int(row['id']) for row in rows) == list(range(1, 31))
+    assert all(row['hourly_rate'] and row['department'] for row in rows)
+
+
+def test_suite_records_every_stage(tmp_path):
+    output = tmp_path / "result.json"
+
+    assert run_benchmarks(['--rows', '60', '--no-memory', '--data-dir', str(tmp_path / 'data'),
+                           '--output', str(output)]) == 0
+
+    stages = json.loads(output.read_text())['stages']
+    for stage in ('read_and_standardize_csv', 'read_and_standardize_json', 'sorting_data', 'group_by',
+                  'report:payout', 'report:average_hourly_rate'):
+        assert stages[stage]['rows'] > 0
+
+
+def test_compare_detects_regressions():
+    baseline = {'meta': {'rows': 10}, 'stages': {'sorting_data': {'rows_per_sec': 1000, 'peak_memory_bytes': 100}}}
+    slower = {'meta': {'rows': 10}, 'stages': {'sorting_data': {'rows_per_sec': 500, 'peak_memory_bytes': 300}}}
+
+    assert len(compare(slower, baseline, tolerance=0.25)) == 2
+    assert compare(baseline, baseline, tolerance=0.25) == []
@@ -0,0 +1,127 @@
+import os
+
+from src.interv.cache import ParsedFileCache
+from src.interv.main import EmployeeData
+from src.interv.table import EmployeeTable, dump_table, load_table
+
+HEADERS = ('emp_id', 'full_name', 'dept', 'hours', 'rate')  # синонимы: в кэш попадают уже стандартизированные строки
+
+
+def test_dump_and_load_table():
+    rows = [
+        {'id': '1', 'email': 'a@example.com', 'name': 'Алиса', 'department': 'HR', 'hours_worked': '', 'hourly_rate': '50'},
+        {'id': '2', 'email': '', 'name': 'Bob', 'department': 'IT', 'hours_worked': '150', 'hourly_rate': 'n/a'},
+    ]
+    restored = load_table(dump_table(EmployeeTable.from_rows(rows)))
+    assert list(restored) == rows
+
+
+def test_cache_hit_skips_parsing(tmp_path, write_csv, monkeypatch):
+    data_file = tmp_path / "data.csv"
+    write_csv(data_file, 5, HEADERS)
+    cache = ParsedFileCache(str(tmp_path / "cache"))
+
+    expected = EmployeeData([str(data_file)]).process_multiple_files()
+    assert EmployeeData([str(data_file)], cache=cache).process_multiple_files() == expected
+
+    def fail(*args, **kwargs):
+        raise AssertionError("файл не должен разбираться повторно")
+
+    monkeypatch.setattr(EmployeeData, 'iter_file', fail)
+    assert EmployeeData([str(data_file)], cache=cache).process_multiple_files() == expected
+    assert list(EmployeeData([str(data_file)], cache=cache).load_table()) == expected
+
+
+def test_cache_invalidated_on_change(tmp_path, write_csv):
+    data_file = tmp_path / "data.csv"
+    write_csv(data_file, 2, HEADERS)
+    cache = ParsedFileCache(str(tmp_path / "cache"))
+    EmployeeData([str(data_file)], cache=cache).process_multiple_files()
+
+    write_csv(data_file, 3, HEADERS)
+    os.utime(data_file, ns=(1, 1))
+    assert len(EmployeeData([str(data_file)], cache=cache).process_multiple_files()) == 3
+
+
+def test_cache_lru_eviction(tmp_path, write_csv):
+    cache = ParsedFileCache(str(tmp_path / "cache"), max_bytes=1)
+    files = []
+    for name in ("a.csv", "b.csv"):
+        data_file = tmp_path / name
+        write_csv(data_file, 3, HEADERS)
+        files.append(str(data_file))
+        EmployeeData([str(data_file)], cache=cache).process_multiple_files()
+
+    # в кэше не больше одной записи — последняя записанная
+    entries = os.listdir(tmp_path / "cache")
+    assert len(entries) <= 1
+    assert cache.get(files[0]) is None
+
+
+def test_corrupted_entry_is_ignored(tmp_path, write_csv):
+    data_file = tmp_path / "data.csv"
+    write_csv(data_file, 2, HEADERS)
+    cache = ParsedFileCache(str(tmp_path / "cache"))
+    with open(cache.entry_path(str(data_file)), 'wb') as file:
+        file.write(b"garbage")
+
+    assert cache.get(str(data_file)) is None
+    assert len(EmployeeData([str(data_file)], cache=cache).process_multiple_files()) == 2
+
+
+def test_parallel_uses_cache(tmp_path, write_csv):
+    data_file = tmp_path / "data.csv"
+    write_csv(data_file, 4, HEADERS)
+    cache = ParsedFileCache(str(tmp_path / "cache"))
+
+    expected = EmployeeData([str(data_file)]).process_multiple_files()
+    assert EmployeeData([str(data_file)], workers=2, cache=cache).process_multiple_files() == expected
+    assert cache.get(str(data_file)) is not None
+
+
+def test_file_changed_during_parse_is_not_cached_as_fresh(tmp_path, write_csv, monkeypatch):
+    data_file = tmp_path / "data.csv"
+    write_csv(data_file, 2, HEADERS)
+    cache = ParsedFileCache(str(tmp_path / "cache"))
+    iter_file = EmployeeData.iter_file
+
+    def iter_and_change(self, file_path):
+        yield from iter_file(self, file_path)
+        write_csv(data_file, 3, HEADERS)  # файл перезаписан, пока разбиралась старая версия
+        os.utime(data_file, ns=(1, 1))
+
+    monkeypatch.setattr(EmployeeData, 'iter_file', iter_and_change)
+    assert len(EmployeeData([str(data_file)], cache=cache).process_multiple_files()) == 2
+    monkeypatch.undo()
+
+    assert cache.get(str(data_file)) is None
+    assert len(EmployeeData([str(data_file)], cache=cache).process_multiple_files()) == 3
+
+
+def test_failed_write_does_not_break_report(tmp_path, write_csv, monkeypatch):
+    data_file = tmp_path / "data.csv"
+    write_csv(data_file, 2, HEADERS)
+    cache_dir = tmp_path / "cache"
+    cache = ParsedFileCache(str(cache_dir))
+
+    def no_space(*args, **kwargs):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(os, 'replace', no_space)
+
+    assert len(EmployeeData([str(data_file)], cache=cache).process_multiple_files()) == 2
+    assert os.listdir(cache_dir) == []
+
+
+def test_eviction_scans_directory_once(tmp_path, write_csv, monkeypatch):
+    cache = ParsedFileCache(str(tmp_path / "cache"))
+    scans = []
+    evict = cache.evict
+    monkeypatch.setattr(cache, 'evict', lambda: scans.append(1) or evict())
+
+    for name in ("a.csv", "b.csv", "c.csv"):
+        write_csv(tmp_path / name, 3, HEADERS)
+        EmployeeData([str(tmp_path / name)], cache=cache).process_multiple_files()
+
+    assert len(scans) == 1
+    assert len(os.listdir(tmp_path / "cache")) == 3
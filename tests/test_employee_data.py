@@ -1,6 +1,7 @@
+import io
 import os
 import pytest
-from src.interv.main import EmployeeData
+from src.interv.main import EmployeeData, iter_json_array
 
 
 def test_validate_files_success(tmp_path):
@@ -153,3 +154,127 @@ def test_group_by_department():
     assert grouped['HR'][0]['name'] == 'Alice'
     assert grouped['HR'][1]['name'] == 'Charlie'
     assert grouped['IT'][0]['name'] == 'Bob'
+
+
+def test_iter_standardized_csv_small_chunks(tmp_path):
+    """Тест: потоковое чтение мелкими блоками дает тот же результат"""
+    content = "full_name,mail,dept,hours,rate,emp_id\r\n" \
+              "Alice,a@example.com,Sales,160,50,1\r\n" \
+              "\r\n" \
+              "Bob,b@example.com,HR,150,60,2"
+    file_path = tmp_path / "stream.csv"
+    file_path.write_text(content)
+
+    expected = EmployeeData([str(file_path)]).read_and_standardize_csv(str(file_path))
+    streamed = list(EmployeeData([str(file_path)], chunk_size=3).iter_standardized_csv(str(file_path)))
+
+    assert streamed == expected
+    assert [row['name'] for row in streamed] == ['Alice', '', 'Bob']
+
+
+@pytest.mark.parametrize('options', [{'chunk_size': 0}, {'chunk_size': -1}, {'workers': 0}, {'workers': -2},
+                                     {'io_concurrency': -1}])
+def test_invalid_reader_settings(options):
+    """Тест: нулевой или отрицательный размер блока и число процессов не игнорируются молча"""
+    with pytest.raises(ValueError):
+        EmployeeData([], **options)
+
+
+def test_iter_rows_is_lazy(tmp_path):
+    """Тест: файлы читаются по мере потребления строк"""
+    file1 = tmp_path / "file1.csv"
+    file1.write_text("id,name\n1,Alice\n")
+
+    rows = EmployeeData([str(file1), "unsupported.txt"]).iter_rows()
+    assert next(rows)['name'] == 'Alice'
+    with pytest.raises(ValueError):
+        next(rows)
+
+
+def test_read_and_standardize_csv_empty_file(tmp_path):
+    file_path = tmp_path / "empty.csv"
+    file_path.write_text("")
+
+    assert EmployeeData([str(file_path)]).read_and_standardize_csv(str(file_path)) == []
+
+
+def test_read_and_standardize_json_small_chunks(tmp_path):
+    """Тест: JSON-массив разбирается потоково, элементы на границах блоков не теряются"""
+    content = '[\n  {"emp_id": 1, "full_name": "Alice", "dept": "HR", "hours": 160, "rate": 50.5},\n' \
+              '  {"ID": "2", "Name": "Bob", "team": "IT"}\n]\n'
+    file_path = tmp_path / "workers.json"
+    file_path.write_text(content)
+
+    result = EmployeeData([str(file_path)], chunk_size=5).read_and_standardize_json(str(file_path))
+
+    assert result == [
+        {'id': '1', 'email': '', 'name': 'Alice', 'department': 'HR', 'hours_worked': '160', 'hourly_rate': '50.5'},
+        {'id': '2', 'email': '', 'name': 'Bob', 'department': 'IT', 'hours_worked': '', 'hourly_rate': ''},
+    ]
+
+
+def test_read_and_standardize_json_not_a_list(tmp_path):
+    file_path = tmp_path / "object.json"
+    file_path.write_text('{"id": 1}')
+
+    with pytest.raises(ValueError) as exc_info:
+        EmployeeData([str(file_path)]).read_and_standardize_json(str(file_path))
+    assert "список объектов JSON" in str(exc_info.value)
+
+
+def test_malformed_json_element_fails_without_reading_whole_file():
+    class CountingReader(io.StringIO):
+        consumed = 0
+
+        def read(self, size=-1):
+            chunk = super().read(size)
+            self.consumed += len(chunk)
+            return chunk
+
+    text = '[{"id": "1"}, {"id": 2,, ' + ' ' * 10_000 + '"name": "x"}]'
+    reader = CountingReader(text)
+    rows = iter_json_array(reader, chunk_size=8, max_element=100)
+
+    assert next(rows) == {'id': '1'}
+    with pytest.raises(ValueError) as exc_info:
+        next(rows)
+    assert "Некорректный JSON" in str(exc_info.value)
+    assert reader.consumed < 200
+
+
+def test_read_and_standardize_json_empty_list(tmp_path):
+    file_path = tmp_path / "empty.json"
+    file_path.write_text(' [ ] ')
+
+    assert EmployeeData([str(file_path)]).read_and_standardize_json(str(file_path)) == []
+
+
+def test_iter_standardized_jsonl(tmp_path):
+    file_path = tmp_path / "workers.jsonl"
+    file_path.write_text('{"id": "1", "name": "Alice"}\n\n{"emp_id": "2", "email": "b@example.com"}\n')
+
+    result = EmployeeData([str(file_path)]).process_multiple_files()
+
+    assert [row['id'] for row in result] == ['1', '2']
+    assert result[1]['email'] == 'b@example.com'
+
+
+def test_columns_projection(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text("email,name,department,hours_worked,salary,id\na@example.com,Alice,HR,160,50,1\n")
+    json_path = tmp_path / "workers.json"
+    json_path.write_text('[{"id": "2", "name": "Bob", "department": "IT", "hours": "150"}]')
+    columns = ('department', 'hourly_rate', 'id')
+
+    for options in ({}, {'mmap_csv': True}, {'io_concurrency': 2}):
+        rows = EmployeeData([str(csv_path), str(json_path)], columns=columns, **options).process_multiple_files()
+        assert rows == [{'id': '1', 'department': 'HR', 'hourly_rate': '50'},
+                        {'id': '2', 'department': 'IT', 'hourly_rate': ''}]
+
+
+def test_columns_projection_keeps_merge_fields():
+    assert EmployeeData([], columns=('department',), dedupe_by=('email',),
+                        on_conflict='sum_hours').fields == ('email', 'department', 'hours_worked')
+    assert EmployeeData([], columns=('department',), cache=object()).fields == EmployeeData([]).fields
+    with pytest.raises(ValueError):
+        EmployeeData([], columns=('salary',))
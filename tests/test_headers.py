@@ -0,0 +1,63 @@
+import copy
+
+import pytest
+
+from src.interv import headers
+from src.interv.headers import (header_mapping_version, register_header_alias, registered_header_aliases,
+                                resolve_header, standardize_headers)
+
+
+@pytest.fixture
+def restore_aliases():
+    saved = copy.deepcopy(headers.HEADER_ALIASES)
+    yield
+    headers.HEADER_ALIASES.clear()
+    headers.HEADER_ALIASES.update(saved)
+    headers._registered_aliases.clear()
+    headers._compile()
+
+
+def test_resolve_header_exact_and_substring():
+    assert resolve_header('emp_id') == 'id'
+    assert resolve_header('contact') == 'email'
+    assert resolve_header('employee_hours') == 'hours_worked'  # поиск подстрокой
+    assert resolve_header('unknown') is None
+
+
+def test_standardize_headers_returns_independent_copies():
+    result = standardize_headers(['ID', 'Rate'])
+    result['id'] = 'changed'
+    assert standardize_headers(['ID', 'Rate']) == {'id': 'id', 'hourly_rate': 'rate'}
+
+
+def test_register_header_alias(restore_aliases, tmp_path):
+    from src.interv.main import EmployeeData
+
+    version = header_mapping_version()
+    assert standardize_headers(['h_work', 'pay']) == {}
+
+    register_header_alias('hours_worked', 'H_Work')
+    register_header_alias('hourly_rate', 'pay')
+
+    assert standardize_headers(['h_work', 'pay']) == {'hours_worked': 'h_work', 'hourly_rate': 'pay'}
+    assert registered_header_aliases() == (('hours_worked', 'h_work'), ('hourly_rate', 'pay'))
+    assert header_mapping_version() != version
+
+    file_path = tmp_path / "aliases.csv"
+    file_path.write_text("id,h_work,pay\n1,160,50\n")
+    for workers in (1, 2):
+        row, = EmployeeData([str(file_path)], workers=workers).process_multiple_files()
+        assert (row['hours_worked'], row['hourly_rate']) == ('160', '50')
+
+
+def test_register_header_alias_unknown_field(restore_aliases):
+    with pytest.raises(ValueError):
+        register_header_alias('salary_total', 'total')
+
+
+def test_registered_alias_maps_exactly_to_its_field(restore_aliases):
+    register_header_alias('hourly_rate', 'paid')  # 'paid' содержит 'id'
+
+    assert standardize_headers(['paid']) == {'hourly_rate': 'paid'}
+    assert resolve_header('paid') == 'hourly_rate'
+    assert resolve_header('paid_total') == 'id'  # без точного совпадения — поиск подстрокой, как раньше
@@ -0,0 +1,137 @@
+import os
+
+import pytest
+
+from src.interv.aggregation import DepartmentAggregator
+from src.interv.incremental import PartialAggregateStore
+from src.interv.main import EmployeeData, ReportGenerator, main
+
+
+def summary(aggregator):
+    return [(department, stats.employees, stats.hours_total, stats.payout_total, stats.average_rate)
+            for department, stats in aggregator.items()]
+
+
+def test_merge_matches_single_pass(department_files):
+    files = department_files
+    reader = EmployeeData(files)
+
+    merged = DepartmentAggregator(order_by_id=True)
+    for file_path in files:
+        merged.merge(DepartmentAggregator(order_by_id=True).consume(reader.iter_file(file_path)))
+
+    assert summary(merged) == summary(DepartmentAggregator(order_by_id=True).consume(reader.iter_rows()))
+    assert [department for department, *_ in summary(merged)] == ['Ops', 'IT', 'HR']
+
+
+def test_store_recomputes_only_changed_files(tmp_path, department_files):
+    files = department_files
+    store = PartialAggregateStore(str(tmp_path / "state"))
+    expected = summary(DepartmentAggregator(order_by_id=True).consume(EmployeeData(files).iter_rows()))
+
+    assert summary(store.aggregate(EmployeeData(files))) == expected
+    assert (store.reused, store.recomputed) == (0, 2)
+
+    assert summary(store.aggregate(EmployeeData(files))) == expected
+    assert (store.reused, store.recomputed) == (2, 0)
+
+    # то же содержимое с новым mtime — совпадает хеш, файл не разбирается
+    stat = os.stat(files[0])
+    os.utime(files[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    store.aggregate(EmployeeData(files))
+    assert (store.reused, store.recomputed) == (2, 0)
+
+    with open(files[0], 'a') as file:
+        file.write("40,Eve,IT,10,70\n")
+    updated = summary(store.aggregate(EmployeeData(files)))
+    assert (store.reused, store.recomputed) == (1, 1)
+    assert updated == summary(DepartmentAggregator(order_by_id=True).consume(EmployeeData(files).iter_rows()))
+
+
+def test_incremental_report_output(tmp_path, department_files, capfd):
+    files = department_files
+    aggregator = PartialAggregateStore(str(tmp_path / "state")).aggregate(EmployeeData(files))
+
+    ReportGenerator(aggregator).run_report('department_summary')
+    incremental, _ = capfd.readouterr()
+    ReportGenerator(EmployeeData(files).iter_rows(), order_by_id=True).run_report('department_summary')
+    full, _ = capfd.readouterr()
+
+    assert incremental == full
+
+
+def test_incremental_rejects_dedupe(tmp_path, department_files):
+    files = department_files
+    with pytest.raises(ValueError):
+        PartialAggregateStore(str(tmp_path / "state")).aggregate(EmployeeData(files, dedupe_by=('id',)))
+
+
+def test_new_file_is_read_once(tmp_path, department_files, monkeypatch):
+    files = department_files
+
+    def fail(file_path):
+        raise AssertionError("новый файл не должен хешироваться отдельно от разбора")
+
+    monkeypatch.setattr('src.interv.incremental.file_digest', fail)
+    store = PartialAggregateStore(str(tmp_path / "state"))
+    store.aggregate(EmployeeData(files))
+    monkeypatch.undo()
+
+    assert (store.reused, store.recomputed) == (0, 2)
+    store.aggregate(EmployeeData(files))
+    assert (store.reused, store.recomputed) == (2, 0)
+
+    # сохраненный хеш совпадает с хешем всего файла: при новом mtime файл не разбирается
+    stat = os.stat(files[1])
+    os.utime(files[1], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    store.aggregate(EmployeeData(files))
+    assert (store.reused, store.recomputed) == (2, 0)
+
+
+def test_file_changed_during_parse_is_not_saved(tmp_path, department_files, monkeypatch):
+    files = department_files
+    iter_stream = EmployeeData.iter_stream
+
+    def iter_and_change(self, file_path, stream):
+        yield from iter_stream(self, file_path, stream)
+        os.utime(file_path, ns=(1, 1))
+
+    monkeypatch.setattr(EmployeeData, 'iter_stream', iter_and_change)
+    store = PartialAggregateStore(str(tmp_path / "state"))
+    store.aggregate(EmployeeData(files))
+    monkeypatch.undo()
+
+    store.aggregate(EmployeeData(files))
+    assert (store.reused, store.recomputed) == (0, 2)
+
+
+@pytest.mark.parametrize('options', [{'workers': 2}, {'io_concurrency': 2}, {'mmap_csv': True}, {'cache': object()}])
+def test_incremental_rejects_ignored_options(tmp_path, department_files, options):
+    files = department_files
+    with pytest.raises(ValueError):
+        PartialAggregateStore(str(tmp_path / "state")).aggregate(EmployeeData(files, **options))
+
+
+def test_incremental_rejects_other_reports(tmp_path, department_files, capfd):
+    files = department_files
+
+    assert main(files, 'payout', incremental_dir=str(tmp_path / "state")) == 1
+
+    _, err = capfd.readouterr()
+    assert "Инкрементальный режим" in err
+    assert not os.path.exists(tmp_path / "state")
+
+
+def test_failed_state_write_does_not_break_report(tmp_path, department_files, monkeypatch):
+    files = department_files
+    state_dir = tmp_path / "state"
+    store = PartialAggregateStore(str(state_dir))
+    expected = summary(DepartmentAggregator(order_by_id=True).consume(EmployeeData(files).iter_rows()))
+
+    def no_space(*args, **kwargs):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(os, 'replace', no_space)
+
+    assert summary(store.aggregate(EmployeeData(files))) == expected
+    assert os.listdir(state_dir) == []
@@ -1,4 +1,7 @@
 import os
+import subprocess
+import sys
+
 import pytest
 from src.interv.main import main
 
@@ -25,3 +28,16 @@ def test_main_payout_report(capfd):
     assert 'Salary' in out
     assert 'ID' in out
     assert 'Name' in out
+
+
+def test_main_runs_as_script(tmp_path):
+    # cron-задания вызывают файл напрямую, без -m и PYTHONPATH
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    script = os.path.join(base_dir, '..', 'src', 'interv', 'main.py')
+    csv_file = os.path.join(base_dir, '..', 'csv', 'data1.csv')
+
+    result = subprocess.run([sys.executable, script, csv_file, '--report', 'payout'],
+                            cwd=tmp_path, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert 'Department:' in result.stdout
@@ -0,0 +1,77 @@
+import pytest
+
+from src.interv.main import EmployeeData
+
+
+@pytest.mark.parametrize('policy, expected', [
+    ('first', [('1', 'Alice Johnson', '160'), ('2', 'Bob Smith', '150')]),
+    ('last', [('525', 'Alice J.', '10'), ('2', 'Bob S.', '5')]),
+    ('sum_hours', [('1', 'Alice Johnson', '170'), ('2', 'Bob Smith', '155')]),
+])
+def test_merge_by_id_or_email(duplicate_files, policy, expected):
+    files = duplicate_files
+
+    rows = EmployeeData(files, dedupe_by=('id', 'email'), on_conflict=policy).process_multiple_files()
+
+    assert [(row['id'], row['name'], row['hours_worked']) for row in rows] == expected
+
+
+def test_merge_by_email_only_keeps_rows_without_email(duplicate_files):
+    files = duplicate_files
+
+    rows = EmployeeData(files, dedupe_by=('email',)).process_multiple_files()
+
+    assert [row['name'] for row in rows] == ['Alice Johnson', 'Bob Smith', 'Bob S.']
+
+
+def test_merge_applies_to_table(duplicate_files):
+    files = duplicate_files
+
+    table = EmployeeData(files, dedupe_by=('id',), on_conflict='sum_hours').load_table()
+
+    assert [row['hours_worked'] for row in table] == ['160', '155', '10']
+
+
+def test_merge_invalid_settings():
+    with pytest.raises(ValueError):
+        EmployeeData([], dedupe_by=('name',))
+    with pytest.raises(ValueError):
+        EmployeeData([], dedupe_by=('id',), on_conflict='average')
+
+
+def test_merge_first_streams_rows():
+    consumed = []
+
+    def source():
+        for i in range(3):
+            consumed.append(i)
+            yield {'id': str(i), 'email': f"u{i}@example.com", 'hours_worked': '1'}
+
+    rows = EmployeeData([], dedupe_by=('id',)).merge_rows(source())
+
+    assert next(rows)['id'] == '0'
+    assert consumed == [0]
+
+
+def test_merge_warns_on_cross_key_conflict(capsys):
+    rows = [
+        {'id': '1', 'email': 'a@example.com', 'hours_worked': '1'},
+        {'id': '2', 'email': 'b@example.com', 'hours_worked': '2'},
+        {'id': '1', 'email': 'b@example.com', 'hours_worked': '3'},  # id первого, email второго
+    ]
+
+    merged = list(EmployeeData([], dedupe_by=('id', 'email'), on_conflict='sum_hours').merge_rows(rows))
+
+    assert [row['hours_worked'] for row in merged] == ['4', '2']
+    assert "id=1/email=b@example.com" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('first, second, expected', [
+    ('', '160', '160'), ('n/a', '160', '160'), ('160', '', '160'), ('', '', ''), ('100', '60', '160'),
+])
+def test_sum_hours_keeps_numeric_side(first, second, expected):
+    rows = [{'id': '1', 'email': '', 'hours_worked': first}, {'id': '1', 'email': '', 'hours_worked': second}]
+
+    merged = list(EmployeeData([], dedupe_by=('id',), on_conflict='sum_hours').merge_rows(rows))
+
+    assert [row['hours_worked'] for row in merged] == [expected]
@@ -0,0 +1,48 @@
+import pytest
+
+from src.interv.main import EmployeeData
+from src.interv.mmap_csv import iter_mmap_csv
+from src.interv.parallel import split_csv_ranges
+
+CASES = {
+    'standard': "id,email,name,department,hours_worked,hourly_rate\n1,a@x.com,Alice,Sales,160,50\n2,b@x.com,Bob,HR,150,40\n",
+    'reordered': "email,name,department,hours_worked,salary,id\na@x.com,Alice,Sales,160,50,1\n",
+    'crlf_no_trailing_newline': "id,name,department,hours,rate\r\n1,Alice,Sales,160,50\r\n2,Bob,HR,150,40",
+    'short_and_blank_rows': "id,name,department,hours,rate\n1,Alice\n\n2,Bob,HR,150,40\n",
+    'duplicate_headers': "id,rate,name,department,hours,rate\n1,10,Alice,Sales,160,50\n",
+    'header_only': "id,name,department,hours,rate\n",
+    'empty': "",
+}
+
+
+@pytest.mark.parametrize('content', CASES.values(), ids=CASES.keys())
+@pytest.mark.parametrize('block_size', [4, 1 << 20])
+def test_mmap_matches_text_reader(tmp_path, content, block_size):
+    file_path = tmp_path / "data.csv"
+    file_path.write_bytes(content.encode())
+
+    expected = EmployeeData([str(file_path)]).read_and_standardize_csv(str(file_path))
+
+    assert list(iter_mmap_csv(str(file_path), block_size=block_size)) == expected
+    assert EmployeeData([str(file_path)], chunk_size=block_size, mmap_csv=True).process_multiple_files() == expected
+
+
+def test_mmap_builds_rows_from_requested_fields(tmp_path):
+    file_path = tmp_path / "data.csv"
+    file_path.write_text(CASES['reordered'])
+
+    rows = list(iter_mmap_csv(str(file_path), fields=('department', 'hourly_rate')))
+
+    assert rows == [{'department': 'Sales', 'hourly_rate': '50'}]
+
+
+def test_mmap_byte_ranges_match_whole_file(tmp_path, write_csv):
+    file_path = tmp_path / "big.csv"
+    write_csv(file_path, 50)
+
+    rows = []
+    for start, end in split_csv_ranges(str(file_path), parts=4, split_size=100):
+        rows.extend(iter_mmap_csv(str(file_path), start, end, block_size=64))
+
+    assert rows == EmployeeData([str(file_path)]).read_and_standardize_csv(str(file_path))
+    assert EmployeeData([str(file_path)], workers=2, mmap_csv=True).process_multiple_files() == rows
@@ -0,0 +1,79 @@
+import statistics
+
+import pytest
+
+from src.interv.main import ReportGenerator
+from src.interv.numeric import rate_statistics, resolve_backend
+from src.interv.output import ReportWriter
+from src.interv.table import EmployeeTable
+
+
+def rows_with_invalid_rates(make_rows, count=200):
+    """строки с целыми и дробными ставками и строки, ставку которых не разобрать"""
+    rows = make_rows(count, fractional_rates=True)
+    rows.append({'id': '900', 'email': '', 'name': 'Bad', 'department': 'HR', 'hours_worked': '', 'hourly_rate': 'n/a'})
+    rows.append({'id': '901', 'email': '', 'name': 'Inf', 'department': 'IT', 'hours_worked': '', 'hourly_rate': 'inf'})
+    rows.append({'id': '902', 'email': '', 'name': 'Empty', 'department': 'Legal', 'hours_worked': '', 'hourly_rate': ''})
+    return rows
+
+
+def test_python_backend_matches_statistics_module(make_rows):
+    rows = rows_with_invalid_rates(make_rows)
+
+    sections = dict(rate_statistics(rows, percentiles=(10, 75), backend='python'))
+
+    for department in ('HR', 'IT', 'Sales'):
+        rates = [float(row['hourly_rate']) for row in rows if row['department'] == department
+                 and row['hourly_rate'] not in ('n/a', 'inf')]
+        record = sections[department]
+        deciles = statistics.quantiles(rates, n=20, method='inclusive')
+        assert record['mean_hourly_rate'] == pytest.approx(statistics.fmean(rates))
+        assert record['median_hourly_rate'] == pytest.approx(statistics.median(rates))
+        assert record['p10_hourly_rate'] == pytest.approx(deciles[1])
+        assert record['p75_hourly_rate'] == pytest.approx(deciles[14])
+        assert record['stddev_hourly_rate'] == pytest.approx(statistics.pstdev(rates))
+    assert sections['Legal'] == {'employees': 1, 'mean_hourly_rate': None, 'median_hourly_rate': None,
+                                 'p10_hourly_rate': None, 'p75_hourly_rate': None, 'stddev_hourly_rate': None}
+
+
+def test_table_and_rows_give_same_statistics(make_rows):
+    rows = rows_with_invalid_rates(make_rows)
+
+    assert rate_statistics(EmployeeTable.from_rows(rows), backend='python') == rate_statistics(rows, backend='python')
+
+
+def test_numpy_backend_matches_python(make_rows):
+    pytest.importorskip('numpy')
+    rows = rows_with_invalid_rates(make_rows, 1000)
+    table = EmployeeTable.from_rows(rows)
+
+    assert rate_statistics(table, (1, 50, 99.9), backend='numpy') == rate_statistics(table, (1, 50, 99.9), backend='python')
+
+
+def test_backend_and_percentile_validation(make_rows):
+    assert resolve_backend('python') == 'python'
+    assert resolve_backend('auto') in ('numpy', 'python')
+    with pytest.raises(ValueError):
+        resolve_backend('fortran')
+    with pytest.raises(ValueError):
+        rate_statistics(rows_with_invalid_rates(make_rows, 5), percentiles=(101,))
+
+
+def test_rate_statistics_report(capfd, make_rows):
+    report = ReportGenerator(rows_with_invalid_rates(make_rows, 20), options={'numeric_backend': 'python'})
+    report.run_report('rate_statistics')
+
+    out, _ = capfd.readouterr()
+    assert "Median Hourly Rate:" in out
+    assert "P90 Hourly Rate:" in out
+    assert "No data available for hourly rate statistics." in out
+
+
+def test_rate_statistics_report_csv_columns(capfd, make_rows):
+    writer = ReportWriter(output_format='csv')
+    rows = rows_with_invalid_rates(make_rows, 20)
+    ReportGenerator(rows, writer=writer, options={'percentiles': (50,)}).run_report('rate_statistics')
+
+    out, _ = capfd.readouterr()
+    assert out.splitlines()[0] == ('department,employees,mean_hourly_rate,median_hourly_rate,'
+                                   'p50_hourly_rate,stddev_hourly_rate')
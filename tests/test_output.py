@@ -0,0 +1,71 @@
+import json
+import os
+from io import StringIO
+
+from src.interv.main import ReportGenerator, main
+from src.interv.output import ReportWriter, csv_field
+
+ROWS = [
+    {'id': '1', 'email': 'a@example.com', 'name': 'Smith, Alice', 'department': 'HR', 'hours_worked': '160',
+     'hourly_rate': '50'},
+    {'id': '2', 'email': 'b@example.com', 'name': 'Bob "B"', 'department': 'IT', 'hours_worked': '150',
+     'hourly_rate': '60'},
+]
+
+
+class CountingStream(StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def test_csv_field_quoting():
+    assert csv_field('plain') == 'plain'
+    assert csv_field('Smith, Alice') == '"Smith, Alice"'
+    assert csv_field('Bob "B"') == '"Bob ""B"""'
+    assert csv_field(None) == ''
+
+
+def test_writer_buffers_output():
+    """Тест: весь отчет пишется в поток одним блоком"""
+    stream = CountingStream()
+    ReportGenerator(ROWS * 100, writer=ReportWriter(stream)).run_report('payout')
+
+    assert stream.writes == 1
+    assert stream.getvalue().count('Smith, Alice') == 100
+
+
+def test_payout_csv_format():
+    stream = StringIO()
+    ReportGenerator(ROWS, writer=ReportWriter(stream, output_format='csv')).run_report('payout')
+
+    assert stream.getvalue().splitlines() == [
+        'department,id,name,email,hours_worked,hourly_rate,salary',
+        'HR,1,"Smith, Alice",a@example.com,160,50,8000',
+        'IT,2,"Bob ""B""",b@example.com,150,60,9000',
+    ]
+
+
+def test_summary_json_format():
+    stream = StringIO()
+    ReportGenerator(ROWS, writer=ReportWriter(stream, output_format='json')).run_report('department_summary')
+
+    records = json.loads(stream.getvalue())
+    assert records[0] == {'department': 'HR', 'employees': 1, 'total_hours': 160, 'total_payout': 8000,
+                          'average_hourly_rate': 50.0}
+
+
+def test_main_writes_output_file(tmp_path, capfd):
+    base_dir = os.path.dirname(__file__)
+    output = tmp_path / "report.json"
+
+    main([os.path.join(base_dir, '../csv/data1.csv')], 'average_hourly_rate', output=str(output),
+         output_format='json')
+
+    out, _ = capfd.readouterr()
+    assert out == ''
+    assert [record['department'] for record in json.loads(output.read_text())] == ['Marketing', 'Design']
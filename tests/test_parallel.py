@@ -0,0 +1,66 @@
+from src.interv.main import EmployeeData
+import pytest
+
+from src.interv.parallel import split_csv_ranges, iter_csv_range, parse_task, plan_tasks
+
+
+def test_split_csv_ranges_on_line_boundaries(tmp_path, write_csv):
+    file_path = tmp_path / "big.csv"
+    write_csv(file_path, 50)
+    content = file_path.read_bytes()
+
+    ranges = split_csv_ranges(str(file_path), parts=4, split_size=100)
+
+    assert len(ranges) > 1
+    assert ranges[0][0] == content.index(b"\n") + 1
+    assert ranges[-1][1] == len(content)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert content[start - 1:start] == b"\n"
+
+
+def test_iter_csv_range_matches_serial(tmp_path, write_csv):
+    file_path = tmp_path / "big.csv"
+    write_csv(file_path, 50)
+    reader = EmployeeData([str(file_path)], chunk_size=16)
+
+    rows = []
+    for start, end in split_csv_ranges(str(file_path), parts=4, split_size=100):
+        rows.extend(iter_csv_range(reader, str(file_path), start, end))
+
+    assert rows == reader.read_and_standardize_csv(str(file_path))
+
+
+def test_parallel_iter_rows_matches_serial(tmp_path, write_csv, write_json):
+    file1 = tmp_path / "a.csv"
+    file2 = tmp_path / "b.csv"
+    write_csv(file1, 20)
+    write_json(file2, [{"id": "7", "name": "Zed", "department": "HR", "hours": "1", "rate": "2"}])
+    files = [str(file1), str(file2), str(file1)]
+
+    serial = EmployeeData(files).process_multiple_files()
+    parallel = EmployeeData(files, workers=2).process_multiple_files()
+
+    assert parallel == serial
+    assert len(plan_tasks(EmployeeData(files, workers=2))) == 3
+
+
+@pytest.mark.parametrize('mmap_csv', [False, True])
+def test_workers_parse_only_report_columns(tmp_path, write_csv, write_json, mmap_csv):
+    file1 = tmp_path / "a.csv"
+    file2 = tmp_path / "b.json"
+    write_csv(file1, 20)
+    write_json(file2, [{"id": "7", "name": "Zed", "department": "HR", "hours": "1", "rate": "2"}])
+    columns = ('id', 'department', 'hourly_rate')
+    employee_data = EmployeeData([str(file1), str(file2)], workers=2, mmap_csv=mmap_csv, columns=columns)
+
+    tasks = plan_tasks(employee_data)
+    tables = [parse_task(task) for task in tasks]
+
+    assert all(task[-1] == columns for task in tasks)
+    for table in tables:
+        for row in table:
+            assert row['name'] == row['email'] == row['hours_worked'] == ''
+            assert row['department'] and row['hourly_rate']
+    serial = EmployeeData(employee_data.files, columns=columns).process_multiple_files()
+    assert employee_data.process_multiple_files() == serial
@@ -0,0 +1,71 @@
+import json
+import os
+import time
+from io import StringIO
+
+from src.interv.main import main
+from src.interv.profiling import NULL_PROFILER, StageProfiler
+
+CSV_DIR = os.path.join(os.path.dirname(__file__), '../csv')
+FILES = [os.path.join(CSV_DIR, name) for name in ('data1.csv', 'data2.csv', 'data3.csv', 'workers.json')]
+
+
+def slow_rows(count):
+    for i in range(count):
+        time.sleep(0.01)
+        yield i
+
+
+def test_timed_iter_excluded_from_outer_stage():
+    profiler = StageProfiler(trace_memory=False)
+    rows = profiler.timed_iter('read', slow_rows(5))
+    with profiler.stage('report') as stage:
+        consumed = sum(1 for _ in rows)
+
+    read = profiler.record('read')
+    assert consumed == read.rows == 5
+    assert read.wall >= 0.05
+    assert stage.wall < read.wall
+    assert [record.name for record in profiler.stages] == ['read', 'report']
+
+
+def test_null_profiler_passes_through():
+    rows = [1, 2, 3]
+    assert NULL_PROFILER.timed_iter('read', rows) is rows
+    with NULL_PROFILER.stage('report') as stage:
+        assert stage is None
+
+
+def test_main_profile_json(capfd):
+    main(FILES, 'payout', profile='json')
+
+    out, err = capfd.readouterr()
+    assert 'Department:' in out
+    stages = {record['stage']: record for record in json.loads(err)['stages']}
+    assert list(stages) == ['validate_files', 'process_multiple_files', 'sorting_data', 'run_report']
+    assert stages['process_multiple_files']['rows'] == 29
+    assert stages['run_report']['peak_memory_bytes'] is not None
+
+
+def test_main_profile_text_streaming_report(capfd):
+    main(FILES, 'average_hourly_rate', profile='text')
+
+    _, err = capfd.readouterr()
+    assert 'process_multiple_files' in err
+    assert 'run_report' in err
+
+
+def test_main_without_profile_writes_nothing_to_stderr(capfd):
+    main(FILES, 'average_hourly_rate')
+
+    _, err = capfd.readouterr()
+    assert err == ''
+
+
+def test_emit_text_format():
+    profiler = StageProfiler(trace_memory=False)
+    with profiler.stage('sorting_data', rows=10):
+        pass
+    stream = StringIO()
+    profiler.emit('text', stream)
+    assert stream.getvalue().splitlines()[1].startswith('sorting_data')
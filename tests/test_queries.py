@@ -0,0 +1,73 @@
+from io import StringIO
+
+import pytest
+
+from src.interv.main import ReportGenerator, calculate_salary, sorting_data
+from src.interv.output import ReportWriter
+from src.interv.queries import SalaryIndex, top_earners
+from src.interv.table import EmployeeTable
+
+
+def brute_force(rows):
+    """эталон: полная сортировка и группировка"""
+    grouped = {}
+    for row in sorting_data(rows):
+        grouped.setdefault(row['department'], []).append(dict(row, salary=calculate_salary(row)))
+    return grouped
+
+
+@pytest.mark.parametrize('as_table', [False, True])
+def test_top_earners_matches_full_sort(as_table, make_rows):
+    rows = make_rows(300)
+    data = EmployeeTable.from_rows(rows) if as_table else rows
+
+    result = top_earners(data, 5, order_by_id=True)
+
+    expected = brute_force(rows)
+    assert [department for department, _ in result] == list(expected)
+    for department, selected in result:
+        ranked = sorted(expected[department], key=lambda row: -row['salary'])  # сортировка устойчива: id по возрастанию
+        assert selected == ranked[:5]
+
+
+@pytest.mark.parametrize('as_table', [False, True])
+def test_salary_range_matches_filter(as_table, make_rows):
+    rows = make_rows(300)
+    index = SalaryIndex(EmployeeTable.from_rows(rows) if as_table else rows, order_by_id=True)
+
+    result = dict(index.salary_range(4500, 4600))
+
+    for department, employees in brute_force(rows).items():
+        matching = sorted((row for row in employees if 4500 <= row['salary'] <= 4600), key=lambda row: row['salary'])
+        assert result.get(department, []) == matching
+
+
+def test_rows_without_salary_are_skipped():
+    rows = [{'id': '1', 'email': '', 'name': 'A', 'department': 'HR', 'hours_worked': '', 'hourly_rate': '10'},
+            {'id': '2', 'email': '', 'name': 'B', 'department': 'IT', 'hours_worked': '5', 'hourly_rate': '10'}]
+
+    assert [department for department, _ in top_earners(rows, 3)] == ['IT']
+    assert SalaryIndex(rows).salary_range() == [('IT', [dict(rows[1], salary=50)])]
+
+
+def test_default_order_is_first_appearance_without_ids():
+    rows = [{'id': 'b-2', 'email': '', 'name': 'A', 'department': 'IT', 'hours_worked': '1', 'hourly_rate': '10'},
+            {'id': 'a-1', 'email': '', 'name': 'B', 'department': 'HR', 'hours_worked': '1', 'hourly_rate': '10'}]
+
+    assert [department for department, _ in top_earners(rows, 3)] == ['IT', 'HR']
+    assert [department for department, _ in SalaryIndex(rows).salary_range()] == ['IT', 'HR']
+
+
+def test_top_earners_report_limit(make_rows):
+    stream = StringIO()
+    report = ReportGenerator(make_rows(50), writer=ReportWriter(stream, output_format='csv'), options={'limit': 1})
+    report.run_report('top_earners')
+
+    assert len(stream.getvalue().splitlines()) == 1 + 3
+
+
+def test_report_option_validation():
+    with pytest.raises(ValueError):
+        ReportGenerator([], options={'limit': 0}).run_report('top_earners')
+    with pytest.raises(ValueError):
+        ReportGenerator([], options={'min_salary': 10, 'max_salary': 1}).run_report('salary_range')
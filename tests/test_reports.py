@@ -120,3 +120,9 @@ def test_generate_payout_report_multiple_files():
     assert "HR" in output
     assert "7200" in output
     assert "6004" in output
+
+
+def test_report_columns_declared_for_every_report():
+    assert set(ReportGenerator.REPORT_COLUMNS) == set(ReportGenerator([]).get_available_reports())
+    assert 'email' not in ReportGenerator.report_columns('average_hourly_rate')
+    assert ReportGenerator.report_columns('unknown') == ReportGenerator.report_columns('payout')
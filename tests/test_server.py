@@ -0,0 +1,138 @@
+import errno
+import json
+import os
+import socket
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.interv.main import EmployeeData, main
+from src.interv.server import ReportService, make_server
+
+CSV_DIR = os.path.join(os.path.dirname(__file__), '../csv')
+FILES = [os.path.join(CSV_DIR, name) for name in ('data1.csv', 'data2.csv', 'data3.csv', 'workers.json')]
+
+
+def make_service(files):
+    service = ReportService(EmployeeData(files))
+    service.load()
+    return service
+
+
+@pytest.mark.parametrize('report_type', ['payout', 'average_hourly_rate', 'department_summary',
+                                         'top_earners', 'salary_range', 'rate_statistics'])
+def test_service_matches_cli(capfd, report_type):
+    main(FILES, report_type)
+    expected, _ = capfd.readouterr()
+
+    assert make_service(FILES).report(report_type) == expected
+
+
+def test_service_memoizes_until_files_change(tmp_path):
+    file_path = tmp_path / "data.csv"
+    file_path.write_text("id,name,department,hours,rate\n1,Alice,HR,160,50\n")
+    service = make_service([str(file_path)])
+
+    first = service.report('payout', 'json')
+    assert service.report('payout', 'json') is first
+    assert service.refresh() is False
+
+    file_path.write_text("id,name,department,hours,rate\n1,Alice,HR,160,50\n2,Bob,IT,150,40\n")
+    os.utime(file_path, ns=(0, os.stat(file_path).st_mtime_ns + 10 ** 9))
+    assert service.refresh() is True
+    assert [row['name'] for row in json.loads(service.report('payout', 'json'))] == ['Alice', 'Bob']
+    assert service.status()['reloads'] == 2
+
+
+def test_service_keeps_data_when_reload_fails(tmp_path):
+    file_path = tmp_path / "data.csv"
+    file_path.write_text("id,name,department,hours,rate\n1,Alice,HR,160,50\n")
+    service = make_service([str(file_path)])
+    file_path.unlink()
+
+    assert service.refresh() is False
+    assert 'не найдены' in service.status()['last_error']
+    assert 'Alice' in service.report('payout')
+
+
+def test_http_server():
+    server = make_server(make_service(FILES), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    try:
+        with urllib.request.urlopen(f"{base}/reports/top_earners?limit=1&format=json") as response:
+            assert response.headers['Content-Type'].startswith('application/json')
+            records = json.loads(response.read())
+        assert len(records) == len({record['department'] for record in records})
+
+        for path, status in (('/reports/unknown', 404), ('/reports/top_earners?limit=x', 400),
+                             ('/reports/payout?format=xml', 400), ('/other', 404)):
+            with pytest.raises(urllib.error.HTTPError) as exc_info:
+                urllib.request.urlopen(base + path)
+            exc_info.value.close()
+            assert exc_info.value.code == status
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="нет Unix-сокетов")
+def test_unix_socket_server(tmp_path):
+    socket_path = str(tmp_path / "reports.sock")
+    server = make_server(make_service(FILES), socket_path=socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with socket.socket(socket.AF_UNIX) as client:
+            client.connect(socket_path)
+            client.sendall(b"GET /status HTTP/1.0\r\n\r\n")
+            response = b''
+            while chunk := client.recv(65536):
+                response += chunk
+        assert response.startswith(b"HTTP/1.0 200")
+        assert json.loads(response.split(b"\r\n\r\n", 1)[1])['rows'] == 29
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert not os.path.exists(socket_path)
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="нет Unix-сокетов")
+def test_unix_socket_keeps_regular_file(tmp_path):
+    file_path = tmp_path / "reports.sock"
+    file_path.write_text("не сокет")
+
+    with pytest.raises(FileExistsError):
+        make_server(make_service(FILES), socket_path=str(file_path))
+    assert file_path.read_text() == "не сокет"
+
+    stale = tmp_path / "stale.sock"
+    with socket.socket(socket.AF_UNIX) as previous:  # сокет, оставшийся от прошлого запуска
+        previous.bind(str(stale))
+    server = make_server(make_service(FILES), socket_path=str(stale))
+    server.server_close()
+    assert not stale.exists()
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="нет Unix-сокетов")
+def test_unix_socket_in_use_is_not_replaced(tmp_path):
+    socket_path = str(tmp_path / "reports.sock")
+    server = make_server(make_service(FILES), socket_path=socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with pytest.raises(OSError) as exc_info:
+            make_server(make_service(FILES), socket_path=socket_path)
+        assert exc_info.value.errno == errno.EADDRINUSE
+
+        with socket.socket(socket.AF_UNIX) as client:  # первый сервер по-прежнему доступен
+            client.connect(socket_path)
+            client.sendall(b"GET /status HTTP/1.0\r\n\r\n")
+            assert client.recv(65536).startswith(b"HTTP/1.0 200")
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert not os.path.exists(socket_path)
@@ -0,0 +1,62 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+CSV_DIR = os.path.join(ROOT, 'csv')
+STARTUP_BUDGET_US = 100_000  # бюджет импорта interv.cli (мкс); сейчас ≈25 мс с кэшем байткода
+# модули, которые не должны загружаться при запуске: их подключают только нужные отчеты и параметры
+LAZY_MODULES = ('json', 'hashlib', 'tracemalloc', 'asyncio', 'mmap', 'concurrent.futures', 'multiprocessing',
+                'http.server', 'numpy', 'interv.queries', 'interv.numeric', 'interv.parallel', 'interv.cache')
+
+
+def import_times(tmp_path, *args):
+    """модули и их суммарное время импорта (мкс) по выводу python -X importtime"""
+    env = dict(os.environ, PYTHONPATH=os.path.join(ROOT, 'src'), PYTHONPYCACHEPREFIX=str(tmp_path))
+    env.pop('PYTHONDONTWRITEBYTECODE', None)  # время компиляции исходников не относится к запуску
+    result = subprocess.run([sys.executable, '-X', 'importtime', *args], env=env, cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, name = line.split('|')
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_startup_skips_optional_modules(tmp_path):
+    import_times(tmp_path, '-c', 'import interv.cli')  # прогрев кэша байткода
+    times = import_times(tmp_path, '-c', 'import interv.cli')
+
+    assert 'interv.main' in times
+    assert [module for module in LAZY_MODULES if module in times] == []
+
+
+def test_cli_startup_budget(tmp_path):
+    import_times(tmp_path, '-c', 'import interv.cli')
+    best = min(import_times(tmp_path, '-c', 'import interv.cli')['interv.cli'] for _ in range(3))
+
+    assert best < STARTUP_BUDGET_US
+
+
+@pytest.mark.parametrize('file_name, json_loaded', [('data1.csv', False), ('workers.json', True)])
+def test_json_loaded_only_for_json_input(tmp_path, file_name, json_loaded):
+    times = import_times(tmp_path, '-m', 'interv.cli', os.path.join(CSV_DIR, file_name), '--report', 'payout')
+
+    assert ('json' in times) is json_loaded
+
+
+def test_console_script_exit_status(tmp_path):
+    env = dict(os.environ, PYTHONPATH=os.path.join(ROOT, 'src'))
+    command = [sys.executable, '-m', 'interv', '--report', 'payout']
+
+    ok = subprocess.run(command + [os.path.join(CSV_DIR, 'data1.csv')], env=env, capture_output=True, text=True)
+    failed = subprocess.run(command + [str(tmp_path / 'missing.csv')], env=env, capture_output=True, text=True)
+
+    assert ok.returncode == 0
+    assert failed.returncode == 1
+    assert failed.stdout == ''
+    assert 'не найдены' in failed.stderr
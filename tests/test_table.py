@@ -0,0 +1,58 @@
+from src.interv.main import EmployeeData, ReportGenerator, sorting_data
+from src.interv.table import EmployeeTable
+
+
+ROWS = [
+    {'id': '12', 'email': 'c@example.com', 'name': 'Carol', 'department': 'HR', 'hours_worked': '100', 'hourly_rate': '40'},
+    {'id': '2', 'email': 'b@example.com', 'name': 'Bob', 'department': 'IT', 'hours_worked': '150', 'hourly_rate': '60'},
+    {'id': '7', 'email': 'a@example.com', 'name': 'Алиса', 'department': 'HR', 'hours_worked': '050', 'hourly_rate': ''},
+]
+
+
+def test_table_round_trip():
+    """Тест: таблица возвращает исходные строки без изменений, включая нечисловые значения"""
+    table = EmployeeTable.from_rows(ROWS)
+
+    assert len(table) == 3
+    assert list(table) == ROWS
+    assert table.ids.values.typecode == 'q'
+    assert table.hours.raw == {2: '050'}
+    assert table.departments.categories == ['HR', 'IT']
+
+
+def test_table_sorting_and_grouping():
+    table = EmployeeTable.from_rows(ROWS)
+
+    sorted_table = sorting_data(table)
+    assert [row['id'] for row in sorted_table] == ['2', '7', '12']
+
+    grouped = EmployeeData([]).group_by(sorted_table, 'department')
+    assert list(grouped.keys()) == ['IT', 'HR']
+    assert [row['name'] for row in grouped['HR']] == ['Алиса', 'Carol']
+
+
+def test_table_extend():
+    table = EmployeeTable.from_rows(ROWS[:1])
+    table.extend(EmployeeTable.from_rows(ROWS[1:]))
+
+    assert list(table) == ROWS
+
+
+def test_reports_on_table_match_rows(capfd):
+    rows = [dict(row, hourly_rate='10') for row in ROWS]
+    for report_type in ('payout', 'average_hourly_rate', 'department_summary'):
+        ReportGenerator(rows).run_report(report_type)
+        expected, _ = capfd.readouterr()
+        ReportGenerator(EmployeeTable.from_rows(rows)).run_report(report_type)
+        out, _ = capfd.readouterr()
+        assert out == expected
+
+
+def test_table_sorted_by_id_duplicates():
+    duplicates = []
+    table = EmployeeTable.from_rows(ROWS + ROWS[:1])
+
+    sorted_table = table.sorted_by_id(duplicates)
+
+    assert [row['id'] for row in sorted_table] == ['2', '7', '12', '12']
+    assert duplicates == [12]
@@ -1,5 +1,6 @@
 from typing import List, Dict
-from src.interv.main import calculate_salary, sorting_data, standardize_headers
+from src.interv.main import calculate_salary, sorting_data, standardize_headers, compile_projection, make_row_builder
+from src.interv.table import FIELD_ORDER, id_order
 
 
 def test_calculate_salary() -> None:
@@ -36,3 +37,47 @@ def test_standardize_headers():
         'hourly_rate': 'wage'
     }
     assert result == expected
+
+
+def test_compile_projection() -> None:
+    """тест на вычисление позиций колонок для стандартных полей"""
+    raw_headers = ['Email', 'name', 'department', 'hours_worked', 'salary', 'id']
+    projection = compile_projection(raw_headers, standardize_headers(raw_headers))
+    assert projection == ((5,), (0,), (1,), (2,), (3,), (4,))
+
+
+def test_make_row_builder_short_and_long_rows() -> None:
+    """тест на сборку строк по проекции: неполные строки и лишние значения"""
+    raw_headers = ['name', 'id', 'dept']
+    build_row = make_row_builder(compile_projection(raw_headers, standardize_headers(raw_headers)))
+
+    assert build_row(['Alice', '1', 'HR', 'extra']) == {
+        'id': '1', 'email': '', 'name': 'Alice', 'department': 'HR', 'hours_worked': '', 'hourly_rate': ''
+    }
+    assert build_row(['Eve']) == {
+        'id': '', 'email': '', 'name': 'Eve', 'department': '', 'hours_worked': '', 'hourly_rate': ''
+    }
+
+
+def test_id_order_dense_sparse_and_duplicates() -> None:
+    """тест на порядок по id: плотные, разреженные и повторяющиеся значения"""
+    assert id_order([3, 1, 2]) == ([1, 2, 0], [])
+    assert id_order([-5, -7, -6]) == ([1, 2, 0], [])
+    assert id_order([10 ** 9, 1, 500]) == ([1, 2, 0], [])
+    assert id_order([2, 1, 2, 1, 3, 2]) == ([1, 3, 0, 2, 5, 4], [1, 2])
+    assert id_order([]) == ([], [])
+
+
+def test_sorting_data_reports_duplicates_and_reuses_rows() -> None:
+    """тест: повторяющиеся id попадают в duplicates, стандартные строки не копируются"""
+    row_a = {'id': '2', 'email': '', 'name': 'A', 'department': 'HR', 'hours_worked': '', 'hourly_rate': ''}
+    row_b = {'id': '1', 'email': '', 'name': 'B', 'department': 'HR', 'hours_worked': '', 'hourly_rate': ''}
+    foreign = {'name': 'C', 'id': '2'}
+    duplicates: List[int] = []
+
+    sorted_data = sorting_data(iter([row_a, row_b, foreign]), duplicates)
+
+    assert [row['name'] for row in sorted_data] == ['B', 'A', 'C']
+    assert sorted_data[0] is row_b
+    assert list(sorted_data[2]) == list(FIELD_ORDER)
+    assert duplicates == [2]